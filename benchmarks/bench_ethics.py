@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmark - ClaudeEthicalOverride.safety_check
+Corpus sintético (chat curto, lições longas, entradas adversariais) em
+todas as faixas etárias e combinações de necessidades especiais
+
+Uso:
+    python -m benchmarks.bench_ethics --save baseline.json
+    python -m benchmarks.bench_ethics --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from itertools import product
+from typing import Dict, List
+
+from src.core.claude_ethics import (
+    DEFAULT_FLAG_PATTERNS, EMOTIONAL_WORDS, ChildContext, ClaudeEthicalOverride
+)
+
+AGES = [3, 6, 9, 12, 15, 18]
+NEEDS_COMBINATIONS = [[], ["autism"], ["adhd"], ["dyslexia"], ["autism", "adhd", "dyslexia"]]
+
+FILLER_WORDS = ("the cat sun water plant learn read school friend game color "
+                "number story tree river happy maybe perhaps however therefore "
+                "because family music draw play").split()
+
+# ---------------------------------------------------------------------------
+# Corpus sintético
+# ---------------------------------------------------------------------------
+
+def _sentence(rng: random.Random, n_words: int, emotional_rate: float) -> str:
+    words = [rng.choice(EMOTIONAL_WORDS) if rng.random() < emotional_rate
+             else rng.choice(FILLER_WORDS) for _ in range(n_words)]
+    return " ".join(words).capitalize() + "."
+
+def _near_misses(rng: random.Random) -> List[str]:
+    """Variações que compartilham prefixos com os padrões, sem completá-los"""
+    misses = []
+    for patterns in DEFAULT_FLAG_PATTERNS.values():
+        for pattern in patterns:
+            cut = rng.randint(max(len(pattern) // 2, 1), len(pattern) - 1)
+            misses.append(pattern[:cut])
+            misses.append(pattern[:-1] + "x")
+    return misses
+
+def generate_corpus(kind: str, n_docs: int, seed: int = 42) -> List[str]:
+    """
+    Gera documentos sintéticos
+
+    Args:
+        kind: "chat" (mensagens curtas), "lesson" (textos longos) ou
+              "adversarial" (repleto de quase-acertos dos red flags)
+        n_docs: Número de documentos
+        seed: Semente para reprodutibilidade
+    """
+    rng = random.Random(f"{kind}-{seed}")
+    docs = []
+
+    for _ in range(n_docs):
+        if kind == "chat":
+            doc = " ".join(_sentence(rng, rng.randint(3, 12), 0.1)
+                           for _ in range(rng.randint(1, 2)))
+        elif kind == "lesson":
+            doc = " ".join(_sentence(rng, rng.randint(8, 30), 0.03)
+                           for _ in range(rng.randint(20, 60)))
+        elif kind == "adversarial":
+            misses = _near_misses(rng)
+            doc = " ".join(rng.choice(misses) for _ in range(rng.randint(80, 200)))
+        else:
+            raise ValueError(f"Tipo de corpus desconhecido: {kind}")
+
+        # Alguns documentos contêm um red flag real
+        if rng.random() < 0.05:
+            flag_patterns = rng.choice(list(DEFAULT_FLAG_PATTERNS.values()))
+            doc += " " + rng.choice(flag_patterns)
+        docs.append(doc)
+
+    return docs
+
+def generate_contexts() -> List[ChildContext]:
+    """Todas as combinações de idade e necessidades especiais"""
+    return [ChildContext(age=age, emotional_state="calm", learning_style="visual",
+                         special_needs=list(needs), guardians=["Guardian"])
+            for age, needs in product(AGES, NEEDS_COMBINATIONS)]
+
+# ---------------------------------------------------------------------------
+# Medição
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+def run_scenario(ethics: ClaudeEthicalOverride, docs: List[str],
+                 contexts: List[ChildContext]) -> Dict[str, float]:
+    """Mede latência, vazão e pico de memória para um corpus"""
+    pairs = [(doc, contexts[i % len(contexts)]) for i, doc in enumerate(docs)]
+
+    # Aquecimento (políticas compiladas, caches do interpretador)
+    for doc, context in pairs[:20]:
+        ethics.safety_check(doc, context)
+
+    latencies = []
+    started = time.perf_counter()
+    for doc, context in pairs:
+        t0 = time.perf_counter_ns()
+        ethics.safety_check(doc, context)
+        latencies.append((time.perf_counter_ns() - t0) / 1e6)
+    total = time.perf_counter() - started
+
+    # Memória medida à parte: tracemalloc distorce a latência
+    tracemalloc.start()
+    for doc, context in pairs:
+        ethics.safety_check(doc, context)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    total_chars = sum(len(doc) for doc in docs)
+    return {
+        "docs": len(docs),
+        "throughput_docs_s": len(docs) / total,
+        "throughput_mb_s": total_chars / total / 1e6,
+        "latency_ms_p50": percentile(latencies, 50),
+        "latency_ms_p90": percentile(latencies, 90),
+        "latency_ms_p99": percentile(latencies, 99),
+        "latency_ms_max": latencies[-1],
+        "peak_memory_kb": peak / 1024
+    }
+
+def run_suite(quick: bool = False) -> Dict:
+    sizes = {"chat": 2000, "lesson": 200, "adversarial": 300}
+    if quick:
+        sizes = {kind: max(n // 10, 20) for kind, n in sizes.items()}
+
+    ethics = ClaudeEthicalOverride()
+    contexts = generate_contexts()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+            "contexts": len(contexts)
+        },
+        "scenarios": {kind: run_scenario(ethics, generate_corpus(kind, n), contexts)
+                      for kind, n in sizes.items()}
+    }
+
+# ---------------------------------------------------------------------------
+# Comparação com baseline
+# ---------------------------------------------------------------------------
+
+# Métrica -> True se maior é melhor
+COMPARED_METRICS = {
+    "throughput_docs_s": True,
+    "latency_ms_p50": False,
+    "latency_ms_p99": False,
+    "peak_memory_kb": False
+}
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Lista regressões acima da tolerância relativa"""
+    regressions = []
+    for kind, metrics in current["scenarios"].items():
+        base = baseline["scenarios"].get(kind)
+        if base is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = base[metric], metrics[metric]
+            if old <= 0:
+                continue
+            change = (new - old) / old
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                regressions.append(f"{kind}.{metric}: {old:.3f} -> {new:.3f} ({change:+.1%})")
+    return regressions
+
+def print_report(results: Dict):
+    header = (f"{'cenário':<12} | {'docs/s':>9} | {'MB/s':>6} | {'p50 ms':>7} | "
+              f"{'p90 ms':>7} | {'p99 ms':>7} | {'pico KB':>8}")
+    print(header)
+    print("-" * len(header))
+    for kind, m in results["scenarios"].items():
+        print(f"{kind:<12} | {m['throughput_docs_s']:>9.0f} | {m['throughput_mb_s']:>6.2f} | "
+              f"{m['latency_ms_p50']:>7.3f} | {m['latency_ms_p90']:>7.3f} | "
+              f"{m['latency_ms_p99']:>7.3f} | {m['peak_memory_kb']:>8.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de safety_check")
+    parser.add_argument("--quick", action="store_true", help="Corpus reduzido")
+    parser.add_argument("--save", metavar="ARQUIVO", help="Salvar resultados como baseline JSON")
+    parser.add_argument("--compare", metavar="ARQUIVO", help="Comparar com baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Variação relativa tolerada antes de acusar regressão")
+    args = parser.parse_args()
+
+    results = run_suite(quick=args.quick)
+    print_report(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Baseline salvo em {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n⚠️ Regressões:")
+            for line in regressions:
+                print(f"  • {line}")
+            sys.exit(1)
+        print("\n✅ Sem regressões em relação ao baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmark - Léxico compilado (mmap) vs listas Python
+Mostra que abrir o léxico mapeado não depende do tamanho do léxico.
+A primeira varredura do matcher mapeado decodifica as transições dos
+estados visitados; as seguintes ficam próximas da versão em dict
+
+Uso: python -m benchmarks.bench_lexicon_load
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.bench_flag_matcher import generate_content, generate_rules
+from src.core.claude_ethics import (
+    EMOTIONAL_WORDS, HEAVY_EMOTIONAL_WORDS, FlagMatcher, MappedLexicon, compile_lexicon
+)
+
+PATTERN_COUNTS = [1000, 10000, 100000]
+
+def elapsed_ms(fn):
+    """Executa fn e retorna (resultado, tempo em ms)"""
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+def main():
+    content = generate_content(800)
+
+    print(f"{'padrões':>8} | {'arquivo (KB)':>12} | {'mmap open (ms)':>14} | "
+          f"{'build dict (ms)':>15} | {'1º scan mmap (ms)':>17} | {'scan mmap (ms)':>14} | "
+          f"{'scan dict (ms)':>14}")
+    print("-" * 112)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_patterns in PATTERN_COUNTS:
+            rules = generate_rules(n_patterns)
+            path = os.path.join(tmp, f"lexicon_{n_patterns}.nxlex")
+            compile_lexicon(path, rules, EMOTIONAL_WORDS, HEAVY_EMOTIONAL_WORDS)
+
+            lexicon, open_ms = elapsed_ms(lambda: MappedLexicon(path))
+            matcher, build_ms = elapsed_ms(lambda: FlagMatcher(rules))
+
+            mapped = lexicon.matcher("red_flags")
+            _, first_scan_ms = elapsed_ms(lambda: mapped.scan(content))
+            _, mapped_scan_ms = elapsed_ms(lambda: mapped.scan(content))
+            _, dict_scan_ms = elapsed_ms(lambda: matcher.scan(content))
+
+            size_kb = os.path.getsize(path) / 1024
+            print(f"{n_patterns:>8} | {size_kb:>12.1f} | {open_ms:>14.3f} | "
+                  f"{build_ms:>15.1f} | {first_scan_ms:>17.3f} | {mapped_scan_ms:>14.3f} | "
+                  f"{dict_scan_ms:>14.3f}")
+
+            lexicon.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmark - Inicialização do NexusRAGSystem (eager vs lazy)
+Cada medição roda em um interpretador novo para incluir o custo dos imports
+
+Uso: python -m benchmarks.bench_rag_startup
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+REPEATS = 3
+
+# Executado em um processo filho: mede import, construção e primeira consulta
+CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+from src.rag.chroma_manager import NexusRAGSystem
+t1 = time.perf_counter()
+rag = NexusRAGSystem(persist_directory=sys.argv[2], lazy=sys.argv[1] == "lazy")
+t2 = time.perf_counter()
+rag.query("emoções básicas", collection="emotional_context")
+t3 = time.perf_counter()
+rag.close()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "init_ms": (t2 - t1) * 1000,
+                  "first_query_ms": (t3 - t2) * 1000, "ready_ms": (t2 - t0) * 1000}))
+"""
+
+def run_child(mode: str, persist_directory: str) -> Dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, mode, persist_directory],
+        check=True, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def median_of(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Primeiro boot: diretório vazio (eager semeia a base no construtor)
+        for mode in ("eager", "lazy"):
+            samples = [run_child(mode, os.path.join(tmp, f"first_{mode}_{i}"))
+                       for i in range(REPEATS)]
+            rows.append((f"{mode} (1º boot)", median_of(samples)))
+
+        # Boot quente: base já semeada
+        seeded = os.path.join(tmp, "seeded")
+        run_child("eager", seeded)
+        for mode in ("eager", "lazy"):
+            rows.append((f"{mode} (quente)", median_of([run_child(mode, seeded)
+                                                        for _ in range(REPEATS)])))
+
+    print(f"{'cenário':<16} | {'import ms':>9} | {'init ms':>9} | {'pronto ms':>9} | {'1ª consulta ms':>14}")
+    print("-" * 70)
+    for name, m in rows:
+        print(f"{name:<16} | {m['import_ms']:>9.1f} | {m['init_ms']:>9.1f} | "
+              f"{m['ready_ms']:>9.1f} | {m['first_query_ms']:>14.1f}")
+
+if __name__ == "__main__":
+    main()
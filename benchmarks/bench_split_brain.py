@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmark - SplitBrainArchitecture.process_input
+Conta chamadas a json.dumps/json.loads durante o processamento e compara
+com o custo das serializações intermediárias que existiam entre os estágios
+
+Uso: python -m benchmarks.bench_split_brain
+"""
+
+import contextlib
+import io
+import json
+import random
+import time
+from typing import Dict, List
+
+import src.architecture.split_brain as split_brain_module
+from src.architecture.split_brain import AnalyzedText, SplitBrainArchitecture
+
+N_INPUTS = 500
+REPEATS = 3
+
+WORDS = ("a inteligência artificial é boa portanto porque contudo além disso "
+         "no entanto feliz triste talvez sempre nunca todos alguns você eu "
+         "como quando escola criança aprende existe tem são problema").split()
+
+class CountingJSON:
+    """Substitui o módulo json dentro de split_brain contando chamadas"""
+
+    def __init__(self):
+        self.calls = {"dumps": 0, "loads": 0}
+
+    def dumps(self, *args, **kwargs):
+        self.calls["dumps"] += 1
+        return json.dumps(*args, **kwargs)
+
+    def loads(self, *args, **kwargs):
+        self.calls["loads"] += 1
+        return json.loads(*args, **kwargs)
+
+def generate_inputs(n: int, seed: int = 5) -> List[str]:
+    rng = random.Random(seed)
+    return [". ".join(" ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 15)))
+                      for _ in range(rng.randint(1, 6))) + "."
+            for _ in range(n)]
+
+def best_of(fn, repeats: int = REPEATS) -> float:
+    """Melhor tempo (ms) entre várias execuções"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def legacy_round_trips(hemispheres: List) -> None:
+    """Reproduz as serializações que existiam entre os estágios"""
+    for left, right in hemispheres:
+        left_json, right_json = left.content.to_json(), right.content.to_json()
+        for _ in range(2):  # validação cruzada e síntese decodificavam de novo
+            json.loads(left_json)
+            json.loads(right_json)
+        combined = {"logical_foundation": json.loads(left_json),
+                    "emotional_context": json.loads(right_json)}
+        json.loads(json.dumps(combined, ensure_ascii=False, indent=2))
+
+def main():
+    inputs = generate_inputs(N_INPUTS)
+    brain = SplitBrainArchitecture()
+    counter = CountingJSON()
+
+    def run_all():
+        for text in inputs:
+            brain.process_input(text)
+
+    original_json = split_brain_module.json
+    split_brain_module.json = counter
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_all()  # Aquecimento e contagem
+            process_ms = best_of(run_all)
+    finally:
+        split_brain_module.json = original_json
+
+    # Tráfego repetido: segunda passada servida pelo cache de resultados
+    cached_brain = SplitBrainArchitecture(result_cache_bytes=64 * 1024 * 1024)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for text in inputs:
+            cached_brain.process_input(text)
+        cached_ms = best_of(lambda: [cached_brain.process_input(text) for text in inputs])
+    cache_stats = cached_brain.cache_stats()
+    cached_brain.shutdown()
+
+    analyzed = [AnalyzedText.from_text(text) for text in inputs]
+    hemispheres = [(brain._left_brain_process(text, {}), brain._right_brain_process(text, {}))
+                   for text in analyzed]
+    legacy_ms = best_of(lambda: legacy_round_trips(hemispheres))
+
+    calls: Dict[str, int] = counter.calls
+    print(f"📏 {N_INPUTS} entradas")
+    print(f"json.dumps em process_input: {calls['dumps']}")
+    print(f"json.loads em process_input: {calls['loads']}")
+    print(f"process_input total:          {process_ms:>9.1f} ms "
+          f"({process_ms / N_INPUTS * 1000:.1f} µs/entrada)")
+    print(f"process_input com cache:      {cached_ms:>9.1f} ms "
+          f"(hit rate {cache_stats['hit_rate']:.0%}, {cache_stats['bytes'] / 1024:.0f} KB)")
+    print(f"round-trips JSON removidos:   {legacy_ms:>9.1f} ms "
+          f"({legacy_ms / N_INPUTS * 1000:.1f} µs/entrada)")
+
+    brain.shutdown()
+
+if __name__ == "__main__":
+    main()
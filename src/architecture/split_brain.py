@@ -4,45 +4,396 @@
 Vetor 4: Arquitetura visionária e multimodal
 """
 
+import copy
+import hashlib
 import json
+import sys
 import threading
-from typing import Dict, Any, List
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import count
+from concurrent.futures import Future, wait
+from typing import Callable, Dict, Any, FrozenSet, List, Optional, Tuple
 from queue import Queue
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+# Vocabulário dos helpers (montado uma vez, no carregamento do módulo)
+LOGICAL_CONNECTORS = ("portanto", "porque", "contudo", "entretanto", "além disso", "no entanto")
+CONCLUSION_MARKERS = frozenset(["portanto", "conclusão"])
+EVIDENCE_MARKERS = frozenset(["porque", "evidência"])
+FACT_INDICATORS = frozenset(["é", "são", "tem", "possui", "ocorre", "existe"])
+POSITIVE_WORDS = frozenset(["bom", "bem", "feliz", "alegre", "amor", "paz"])
+NEGATIVE_WORDS = frozenset(["ruim", "mal", "triste", "raiva", "ódio", "medo"])
+NEUTRAL_WORDS = frozenset(["talvez", "possivelmente", "aproximadamente", "geralmente"])
+PERSONAL_MARKERS = frozenset(["eu", "me", "minha", "meu"])
+ADDRESS_MARKERS = frozenset(["você", "te", "sua", "seu"])
+NEGATIVE_FACT_MARKERS = frozenset(["problem", "issue", "error", "fail"])
+# Ordem importa: o primeiro marcador encontrado define o tipo
+QUESTION_TYPES = (("como", "process"), ("por que", "cause"), ("o que", "definition"),
+                  ("quando", "time"), ("onde", "location"))
+
+# Itens (frases/tokens) processados entre pontos de cancelamento dentro de um estágio
+CHECKPOINT_INTERVAL = 256
+
+# Opções de config que alteram o conteúdo de um resultado completo; prazo,
+# workers e log só afetam se ele sai degradado, e degradados não são cacheados
+RESULT_CONFIG_KEYS = ("min_confidence_threshold", "enable_cross_validation")
+
 class ProcessingMode(Enum):
     ANALYTICAL = "analytical"      # Lógica, fatos, estrutura
     EMOTIONAL = "emotional"        # Empatia, criatividade, contexto
     SYNTHETIC = "synthetic"        # Síntese das duas perspectivas
 
+@dataclass
+class AnalyzedText:
+    """Texto de entrada pré-processado uma vez por requisição"""
+    raw: str
+    lower: str
+    tokens: List[str]
+    token_set: FrozenSet[str]
+    sentences: List[str]
+    sentences_lower: List[str]
+    period_count: int
+    connector_counts: Dict[str, int]
+    
+    @classmethod
+    def from_text(cls, text: str) -> "AnalyzedText":
+        lower = text.lower()
+        tokens = lower.split()
+        sentences = [s.strip() for s in text.split('.') if s.strip()]
+        return cls(
+            raw=text,
+            lower=lower,
+            tokens=tokens,
+            token_set=frozenset(tokens),
+            sentences=sentences,
+            sentences_lower=[s.lower() for s in sentences],
+            period_count=text.count('.'),
+            connector_counts={connector: lower.count(connector) for connector in LOGICAL_CONNECTORS}
+        )
+
+class HemispherePayload(ABC):
+    """Conteúdo em memória de um estágio; serializado só na borda da API"""
+    
+    @abstractmethod
+    def to_dict(self) -> Dict:
+        """Representação serializável do conteúdo"""
+    
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, **kwargs)
+
+@dataclass
+class AnalyticalPayload(HemispherePayload):
+    logical_analysis: Dict[str, Any]
+    facts_extracted: List[str]
+    consistency_check: Dict[str, Any]
+    
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+@dataclass
+class EmotionalPayload(HemispherePayload):
+    emotional_analysis: Dict[str, Any]
+    implicit_context: Dict[str, Any]
+    creative_alternatives: List[str]
+    
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+@dataclass
+class SynthesisPayload(HemispherePayload):
+    data: Dict[str, Any]
+    
+    def to_dict(self) -> Dict:
+        return self.data
+
 @dataclass
 class BrainHemisphere:
     mode: ProcessingMode
-    content: str
+    content: HemispherePayload
     metadata: Dict[str, Any]
     confidence: float
     processing_time: float
 
+class HemisphereCancelled(Exception):
+    """Processamento de um hemisfério abandonado após o prazo"""
+
+@dataclass
+class HemisphereJob:
+    """Pedido enviado à fila de um hemisfério"""
+    text: AnalyzedText
+    context: Dict
+    future: Future
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    # Coordenação worker/requisição quando o prazo estoura
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    worker: Optional[threading.Thread] = None
+    finished: bool = False
+    abandoned: bool = False
+
+def _estimate_size(obj: Any) -> int:
+    """Estimativa (bytes) da memória ocupada por um resultado"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_estimate_size(k) + _estimate_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_estimate_size(item) for item in obj)
+    return size
+
+class ResultCache:
+    """Cache LRU de resultados de process_input, limitado em bytes"""
+    
+    def __init__(self, max_bytes: int):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes deve ser positivo")
+        
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[int, Dict]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejected = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Tuple) -> Optional[Dict]:
+        """Retorna uma cópia do resultado cacheado ou None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(entry[1])
+    
+    def put(self, key: Tuple, result: Dict):
+        """Armazena cópia do resultado, removendo os menos recentes até caber"""
+        result = copy.deepcopy(result)
+        size = _estimate_size(result)
+        
+        with self._lock:
+            if size > self.max_bytes:
+                self.rejected += 1
+                return
+            
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[0]
+            
+            self._entries[key] = (size, result)
+            self._bytes += size
+            
+            while self._bytes > self.max_bytes:
+                _, (evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de uso do cache"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "rejected": self.rejected,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
 class SplitBrainArchitecture:
     """
     Arquitetura Split-Brain inspirada no Gemini
     Divide processamento entre perspectivas analíticas e emocionais
     """
     
-    def __init__(self):
+    def __init__(self, result_cache_bytes: int = 0):
         self.left_brain_queue = Queue()  # Analítico
         self.right_brain_queue = Queue() # Emocional
-        self.synthesis_queue = Queue()   # Síntese
         
         # Configurações
         self.config = {
             "max_processing_time": 5.0,
             "min_confidence_threshold": 0.6,
             "enable_cross_validation": True,
-            "log_level": "INFO"
+            "log_level": "INFO",
+            "workers_per_hemisphere": 1,
+            # Workers presos em pedidos abandonados (por hemisfério); no limite,
+            # o hemisfério falha rápido até algum deles terminar
+            "max_stuck_workers": 4
+        }
+        
+        # Workers persistentes alimentados pelas filas (iniciados sob demanda)
+        self._workers: List[Tuple[threading.Thread, Queue]] = []
+        self._workers_lock = threading.Lock()
+        self._worker_ids = count()
+        self._stuck: Dict[str, List[threading.Thread]] = {name: [] for name in self._hemispheres()}
+        
+        # Cache opcional de resultados (desligado com 0 bytes)
+        self.result_cache: Optional[ResultCache] = None
+        if result_cache_bytes > 0:
+            self.result_cache = ResultCache(result_cache_bytes)
+    
+    def _hemispheres(self) -> Dict[str, Tuple[Queue, Callable[..., BrainHemisphere], str]]:
+        """Fila, função de processamento e prefixo de thread de cada hemisfério"""
+        return {
+            "analytical": (self.left_brain_queue, self._left_brain_process, "left-brain"),
+            "emotional": (self.right_brain_queue, self._right_brain_process, "right-brain")
         }
     
+    def _ensure_workers(self):
+        """Inicia os workers dos hemisférios na primeira chamada"""
+        if self._workers:
+            return
+        
+        with self._workers_lock:
+            if self._workers:
+                return
+            
+            for hemisphere in self._hemispheres():
+                for _ in range(self.config["workers_per_hemisphere"]):
+                    self._start_worker(hemisphere)
+    
+    def _start_worker(self, hemisphere: str):
+        """Inicia um worker (chamar com _workers_lock)"""
+        queue, process, prefix = self._hemispheres()[hemisphere]
+        worker = threading.Thread(target=self._hemisphere_worker, args=(queue, process),
+                                  name=f"{prefix}-{next(self._worker_ids)}", daemon=True)
+        worker.start()
+        self._workers.append((worker, queue))
+    
+    def _replenish(self, hemisphere: str) -> int:
+        """
+        Descarta workers presos que já terminaram e repõe os substitutos
+        dentro do limite max_stuck_workers (chamar com _workers_lock).
+        Retorna quantos workers ativos o hemisfério tem.
+        """
+        stuck = self._stuck[hemisphere] = [t for t in self._stuck[hemisphere] if t.is_alive()]
+        queue = self._hemispheres()[hemisphere][0]
+        active = sum(1 for _, worker_queue in self._workers if worker_queue is queue)
+        while (active < self.config["workers_per_hemisphere"]
+               and len(stuck) < self.config["max_stuck_workers"]):
+            self._start_worker(hemisphere)
+            active += 1
+        return active
+    
+    def _available(self, hemisphere: str) -> bool:
+        """O hemisfério tem worker ativo (sem presos, não há o que verificar)"""
+        if not self._stuck[hemisphere]:
+            return True
+        with self._workers_lock:
+            return self._replenish(hemisphere) > 0
+    
+    def _hemisphere_worker(self, queue: Queue, process: Callable[..., BrainHemisphere]):
+        """Loop de um worker: consome pedidos da fila do hemisfério"""
+        while True:
+            job = queue.get()
+            if job is None:  # Sentinela de shutdown
+                break
+            
+            # Pedidos cancelados enquanto esperavam na fila são descartados
+            job.worker = threading.current_thread()
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            
+            try:
+                result, error = process(job.text, job.context, job.cancel_event), None
+            except BaseException as exc:
+                result, error = None, exc
+            
+            with job.lock:
+                job.finished = True
+                abandoned = job.abandoned
+            
+            if error is None:
+                job.future.set_result(result)
+            else:
+                job.future.set_exception(error)
+            
+            # Pedido abandonado por prazo: um substituto já assumiu a fila
+            if abandoned:
+                break
+    
+    def _abandon(self, hemisphere: str, job: HemisphereJob):
+        """
+        Cancela um pedido que estourou o prazo. Se ainda estava na fila, é
+        descartado; se já estava em execução, o worker preso é substituído
+        para não atrasar as próximas requisições desse hemisfério. Com
+        max_stuck_workers presos, não há substituto: o hemisfério fica
+        indisponível (falha rápido) até algum deles terminar.
+        """
+        job.cancel_event.set()
+        if job.future.cancel():
+            return
+        
+        with job.lock:
+            if job.finished:
+                return
+            job.abandoned = True
+        
+        with self._workers_lock:
+            self._workers = [(worker, queue) for worker, queue in self._workers
+                             if worker is not job.worker]
+            self._stuck[hemisphere].append(job.worker)
+            self._replenish(hemisphere)
+    
+    def shutdown(self):
+        """Encerra os workers dos hemisférios"""
+        with self._workers_lock:
+            for _, queue in self._workers:
+                queue.put(None)
+            for worker, _ in self._workers:
+                worker.join()
+            self._workers = []
+    
+    def _submit(self, queue: Queue, text: AnalyzedText, context: Dict) -> HemisphereJob:
+        """Enfileira processamento em um hemisfério"""
+        job = HemisphereJob(text, context, Future())
+        queue.put(job)
+        return job
+    
+    @staticmethod
+    def _checkpoint(cancel_event: Optional[threading.Event]):
+        """Ponto de cancelamento cooperativo dos estágios de um hemisfério"""
+        if cancel_event is not None and cancel_event.is_set():
+            raise HemisphereCancelled()
+    
+    def _result_key(self, input_data: str, context: Dict) -> Optional[Tuple]:
+        """
+        Chave do cache: entrada normalizada (NFC, espaços colapsados),
+        contexto canônico e impressão digital das opções que alteram o
+        resultado (RESULT_CONFIG_KEYS); workers, prazo e log não entram.
+        None se o contexto não puder ser canonizado.
+        """
+        normalized = " ".join(unicodedata.normalize("NFC", input_data).split())
+        try:
+            context_key = json.dumps(context, sort_keys=True, ensure_ascii=False)
+            config_key = json.dumps({name: self.config.get(name) for name in RESULT_CONFIG_KEYS},
+                                    sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        
+        digest = hashlib.sha256(normalized.encode("utf-8", "surrogatepass")).digest()
+        return (digest, context_key, config_key)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Métricas do cache de resultados (vazio se desligado)"""
+        return self.result_cache.stats() if self.result_cache is not None else {}
+    
     def process_input(self, input_data: str, context: Dict = None) -> Dict:
         """
         Processa entrada através da arquitetura split-brain
@@ -58,102 +409,159 @@ class SplitBrainArchitecture:
             context = {}
         
         print(f"🧠 Processando com Split-Brain: {input_data[:50]}...")
+        started = time.perf_counter()
+        
+        # 0. Cache: entradas repetidas não passam pelos hemisférios nem pela síntese
+        cache = self.result_cache
+        key = self._result_key(input_data, context) if cache is not None else None
+        if key is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                cached["timestamp"] = self._get_timestamp()
+                # Tempos medidos nesta chamada: nenhum hemisfério rodou
+                summary = cached["processing_summary"]
+                summary["cache_hit"] = True
+                summary["hemisphere_times"] = {}
+                summary["total_time"] = time.perf_counter() - started
+                return cached
+        
+        # 1. Processamento paralelo (workers persistentes de cada hemisfério)
+        self._ensure_workers()
+        text = AnalyzedText.from_text(input_data)
+        jobs = {}
+        missing = []
+        for name, (queue, _, _) in self._hemispheres().items():
+            if self._available(name):
+                jobs[name] = self._submit(queue, text, context)
+            else:
+                missing.append(name)  # Todos os workers presos: não esperar o prazo
         
-        # 1. Processamento paralelo
-        left_result = self._left_brain_process(input_data, context)
-        right_result = self._right_brain_process(input_data, context)
+        # Prazo total da requisição, incluindo espera nas filas
+        done, _ = wait([job.future for job in jobs.values()],
+                       timeout=self.config["max_processing_time"])
         
-        # 2. Validação cruzada
-        if self.config["enable_cross_validation"]:
-            validation = self._cross_validate(left_result, right_result)
-        else:
-            validation = {"valid": True, "conflicts": []}
+        results: Dict[str, BrainHemisphere] = {}
+        for name, job in jobs.items():
+            if job.future in done:
+                results[name] = job.future.result()
+            else:
+                # Cancela o trabalho atrasado (na fila ou em execução)
+                self._abandon(name, job)
+                missing.append(name)
+        missing.sort(key=list(self._hemispheres()).index)
+        
+        hemisphere_times = {name: result.processing_time for name, result in results.items()}
         
-        # 3. Síntese
-        synthesis = self._synthesize_results(left_result, right_result, validation)
+        if missing:
+            # 2-3. Síntese degradada com o que terminou no prazo
+            validation = {"valid": False, "conflicts": [], "deadline_exceeded": True}
+            synthesis = self._degraded_synthesis(results, missing)
+        else:
+            left_result, right_result = results["analytical"], results["emotional"]
+            
+            # 2. Validação cruzada
+            if self.config["enable_cross_validation"]:
+                validation = self._cross_validate(left_result, right_result)
+            else:
+                validation = {"valid": True, "conflicts": []}
+            
+            # 3. Síntese
+            synthesis = self._synthesize_results(left_result, right_result, validation)
         
         # 4. Formatar resultado final
-        final_result = self._format_final_output(synthesis, validation)
+        final_result = self._format_final_output(synthesis, validation, hemisphere_times,
+                                                 time.perf_counter() - started)
+        
+        # Resultados degradados dependem da carga do momento: não são cacheados
+        if key is not None and not missing:
+            cache.put(key, final_result)
         
         return final_result
     
-    def _left_brain_process(self, input_data: str, context: Dict) -> BrainHemisphere:
+    def _left_brain_process(self, text: AnalyzedText, context: Dict,
+                            cancel_event: Optional[threading.Event] = None) -> BrainHemisphere:
         """Processamento analítico (lógico, factual)"""
+        start = time.perf_counter()
         
         # Análise lógica
-        logical_structure = self._analyze_logical_structure(input_data)
+        logical_structure = self._analyze_logical_structure(text, cancel_event)
+        self._checkpoint(cancel_event)
         
         # Extração de fatos
-        facts = self._extract_facts(input_data)
+        facts = self._extract_facts(text, cancel_event)
+        self._checkpoint(cancel_event)
         
         # Verificação de consistência
-        consistency = self._check_consistency(input_data)
+        consistency = self._check_consistency(text)
         
         return BrainHemisphere(
             mode=ProcessingMode.ANALYTICAL,
-            content=json.dumps({
-                "logical_analysis": logical_structure,
-                "facts_extracted": facts,
-                "consistency_check": consistency
-            }, ensure_ascii=False),
+            content=AnalyticalPayload(
+                logical_analysis=logical_structure,
+                facts_extracted=facts,
+                consistency_check=consistency
+            ),
             metadata={
                 "processing_type": "logical_analysis",
-                "word_count": len(input_data.split()),
-                "sentence_count": input_data.count('.') + 1
+                "word_count": len(text.tokens),
+                "sentence_count": text.period_count + 1
             },
             confidence=consistency.get("confidence", 0.7),
-            processing_time=0.5  # Simulado
+            processing_time=time.perf_counter() - start
         )
     
-    def _right_brain_process(self, input_data: str, context: Dict) -> BrainHemisphere:
+    def _right_brain_process(self, text: AnalyzedText, context: Dict,
+                             cancel_event: Optional[threading.Event] = None) -> BrainHemisphere:
         """Processamento emocional (criativo, contextual)"""
+        start = time.perf_counter()
         
         # Análise emocional
-        emotional_tone = self._analyze_emotional_tone(input_data)
+        emotional_tone = self._analyze_emotional_tone(text, cancel_event)
+        self._checkpoint(cancel_event)
         
         # Contexto implícito
-        implicit_context = self._extract_implicit_context(input_data, context)
+        implicit_context = self._extract_implicit_context(text, context)
+        self._checkpoint(cancel_event)
         
         # Criatividade e alternativas
-        alternatives = self._generate_alternatives(input_data)
+        alternatives = self._generate_alternatives(text)
         
         return BrainHemisphere(
             mode=ProcessingMode.EMOTIONAL,
-            content=json.dumps({
-                "emotional_analysis": emotional_tone,
-                "implicit_context": implicit_context,
-                "creative_alternatives": alternatives
-            }, ensure_ascii=False),
+            content=EmotionalPayload(
+                emotional_analysis=emotional_tone,
+                implicit_context=implicit_context,
+                creative_alternatives=alternatives
+            ),
             metadata={
                 "processing_type": "emotional_analysis",
                 "emotional_depth": emotional_tone.get("depth", "medium"),
                 "context_sensitivity": "high" if implicit_context else "medium"
             },
             confidence=emotional_tone.get("confidence", 0.7),
-            processing_time=0.5  # Simulado
+            processing_time=time.perf_counter() - start
         )
     
     def _cross_validate(self, left: BrainHemisphere, right: BrainHemisphere) -> Dict:
         """Validação cruzada entre os dois hemisférios"""
         
-        left_data = json.loads(left.content)
-        right_data = json.loads(right.content)
+        left_data = left.content
+        right_data = right.content
         
         conflicts = []
         
         # Verificar contradições entre análise lógica e emocional
-        if "facts_extracted" in left_data:
-            facts = left_data["facts_extracted"]
-            emotional_tone = right_data["emotional_analysis"]
-            
-            # Exemplo: fato negativo com tom positivo
-            if emotional_tone.get("primary_tone") == "positive":
-                for fact in facts:
-                    if any(neg in fact.lower() for neg in ["problem", "issue", "error", "fail"]):
-                        conflicts.append("Fato negativo com tom emocional positivo")
+        facts = left_data.facts_extracted
+        emotional_tone = right_data.emotional_analysis
+        
+        # Exemplo: fato negativo com tom positivo
+        if emotional_tone.get("primary_tone") == "positive":
+            for fact in facts:
+                if any(neg in fact.lower() for neg in NEGATIVE_FACT_MARKERS):
+                    conflicts.append("Fato negativo com tom emocional positivo")
         
         # Verificar consistência interna
-        consistency_left = left_data.get("consistency_check", {})
+        consistency_left = left_data.consistency_check
         if not consistency_left.get("is_consistent", True):
             conflicts.append(f"Inconsistência analítica: {consistency_left.get('issues', [])}")
         
@@ -169,8 +577,9 @@ class SplitBrainArchitecture:
                            validation: Dict) -> BrainHemisphere:
         """Sintetiza resultados dos dois hemisférios"""
         
-        left_data = json.loads(left.content)
-        right_data = json.loads(right.content)
+        # Cópias independentes: o resultado final não compartilha estado com os hemisférios
+        left_data = left.content.to_dict()
+        right_data = right.content.to_dict()
         
         # Estratégia de síntese baseada na validação
         if validation["valid"]:
@@ -217,7 +626,7 @@ class SplitBrainArchitecture:
         
         return BrainHemisphere(
             mode=ProcessingMode.SYNTHETIC,
-            content=json.dumps(combined, ensure_ascii=False, indent=2),
+            content=SynthesisPayload(combined),
             metadata={
                 "synthesis_strategy": synthesis_strategy,
                 "input_modes": ["analytical", "emotional"],
@@ -227,56 +636,113 @@ class SplitBrainArchitecture:
             processing_time=left.processing_time + right.processing_time
         )
     
-    def _format_final_output(self, synthesis: BrainHemisphere, validation: Dict) -> Dict:
+    def _degraded_synthesis(self, results: Dict[str, BrainHemisphere],
+                            missing: List[str]) -> BrainHemisphere:
+        """Síntese parcial quando um hemisfério excede o prazo"""
+        
+        combined: Dict[str, Any] = {"degraded": True, "missing_hemispheres": missing}
+        
+        if "analytical" in results:
+            available = results["analytical"]
+            combined.update({
+                "primary_basis": "analytical",
+                "analytical_data": available.content.to_dict(),
+                "resolution": "Síntese parcial: hemisfério emocional excedeu o prazo",
+                "recommended_approach": "logical_first"
+            })
+        elif "emotional" in results:
+            available = results["emotional"]
+            combined.update({
+                "primary_basis": "emotional",
+                "emotional_data": available.content.to_dict(),
+                "resolution": "Síntese parcial: hemisfério analítico excedeu o prazo",
+                "recommended_approach": "emotional_first"
+            })
+        else:
+            available = None
+            combined.update({
+                "resolution": "Nenhum hemisfério concluiu dentro do prazo",
+                "recommended_approach": "retry"
+            })
+        
+        return BrainHemisphere(
+            mode=ProcessingMode.SYNTHETIC,
+            content=SynthesisPayload(combined),
+            metadata={
+                "synthesis_strategy": "degraded",
+                "input_modes": list(results),
+                "validation_result": False
+            },
+            # Sem a outra perspectiva a confiança cai pela metade
+            confidence=available.confidence * 0.5 if available else 0.0,
+            processing_time=sum(result.processing_time for result in results.values())
+        )
+    
+    def _format_final_output(self, synthesis: BrainHemisphere, validation: Dict,
+                             hemisphere_times: Optional[Dict[str, float]] = None,
+                             total_time: Optional[float] = None) -> Dict:
         """Formata o resultado final para saída"""
         
-        synthesis_data = json.loads(synthesis.content)
+        synthesis_data = synthesis.content.to_dict()
         
         return {
             "version": "1.0",
             "architecture": "split_brain_gemini",
             "timestamp": self._get_timestamp(),
             "processing_summary": {
-                "total_time": synthesis.processing_time,
+                "total_time": synthesis.processing_time if total_time is None else total_time,
+                "hemisphere_times": hemisphere_times or {},
                 "synthesis_confidence": synthesis.confidence,
-                "validation_passed": validation["valid"]
+                "validation_passed": validation["valid"],
+                "degraded": synthesis_data.get("degraded", False),
+                "missing_hemispheres": synthesis_data.get("missing_hemispheres", []),
+                "cache_hit": False
             },
             "content": synthesis_data,
             "recommendations": self._generate_recommendations(synthesis_data, validation),
             "next_steps": self._suggest_next_steps(synthesis_data, validation)
         }
     
-    def _analyze_logical_structure(self, text: str) -> Dict:
+    def _analyze_logical_structure(self, text: AnalyzedText,
+                                   cancel_event: Optional[threading.Event] = None) -> Dict:
         """Analisa estrutura lógica do texto"""
         # Implementação simplificada
-        sentences = [s.strip() for s in text.split('.') if s.strip()]
+        sentences = text.sentences
+        
+        total_words = 0
+        for i, sentence in enumerate(sentences):
+            if i % CHECKPOINT_INTERVAL == 0:
+                self._checkpoint(cancel_event)
+            total_words += len(sentence.split())
         
         return {
             "sentence_count": len(sentences),
-            "avg_words_per_sentence": sum(len(s.split()) for s in sentences) / max(len(sentences), 1),
-            "has_conclusion": "portanto" in text.lower() or "conclusão" in text.lower(),
-            "has_evidence": "porque" in text.lower() or "evidência" in text.lower(),
+            "avg_words_per_sentence": total_words / max(len(sentences), 1),
+            "has_conclusion": any(marker in text.lower for marker in CONCLUSION_MARKERS),
+            "has_evidence": any(marker in text.lower for marker in EVIDENCE_MARKERS),
             "logical_connectors": self._count_logical_connectors(text),
             "structure_type": self._determine_structure_type(text)
         }
     
-    def _extract_facts(self, text: str) -> List[str]:
+    def _extract_facts(self, text: AnalyzedText,
+                       cancel_event: Optional[threading.Event] = None) -> List[str]:
         """Extrai fatos do texto"""
         # Implementação simplificada
-        fact_indicators = ["é", "são", "tem", "possui", "ocorre", "existe"]
-        
-        sentences = [s.strip() for s in text.split('.') if s.strip()]
         facts = []
         
-        for sentence in sentences:
-            if any(indicator in sentence.lower() for indicator in fact_indicators):
+        for i, (sentence, sentence_lower) in enumerate(zip(text.sentences, text.sentences_lower)):
+            if i % CHECKPOINT_INTERVAL == 0:
+                self._checkpoint(cancel_event)
+            if any(indicator in sentence_lower for indicator in FACT_INDICATORS):
                 facts.append(sentence)
+                if len(facts) == 5:  # Limitar a 5 fatos
+                    break
         
-        return facts[:5]  # Limitar a 5 fatos
+        return facts
     
-    def _check_consistency(self, text: str) -> Dict:
+    def _check_consistency(self, text: AnalyzedText) -> Dict:
         """Verifica consistência interna"""
-        words = text.lower().split()
+        words = text.token_set
         
         issues = []
         
@@ -293,17 +759,20 @@ class SplitBrainArchitecture:
             "confidence": 1.0 - (len(issues) * 0.2)
         }
     
-    def _analyze_emotional_tone(self, text: str) -> Dict:
+    def _analyze_emotional_tone(self, text: AnalyzedText,
+                                cancel_event: Optional[threading.Event] = None) -> Dict:
         """Analisa tom emocional"""
-        positive_words = ["bom", "bem", "feliz", "alegre", "amor", "paz"]
-        negative_words = ["ruim", "mal", "triste", "raiva", "ódio", "medo"]
-        neutral_words = ["talvez", "possivelmente", "aproximadamente", "geralmente"]
-        
-        words = text.lower().split()
-        
-        pos_count = sum(1 for word in words if word in positive_words)
-        neg_count = sum(1 for word in words if word in negative_words)
-        neu_count = sum(1 for word in words if word in neutral_words)
+        pos_count = neg_count = neu_count = 0
+        
+        for i, word in enumerate(text.tokens):
+            if i % CHECKPOINT_INTERVAL == 0:
+                self._checkpoint(cancel_event)
+            if word in POSITIVE_WORDS:
+                pos_count += 1
+            elif word in NEGATIVE_WORDS:
+                neg_count += 1
+            elif word in NEUTRAL_WORDS:
+                neu_count += 1
         
         total = pos_count + neg_count + neu_count
         
@@ -329,19 +798,19 @@ class SplitBrainArchitecture:
             "depth": "deep" if total > 10 else "shallow"
         }
     
-    def _extract_implicit_context(self, text: str, context: Dict) -> Dict:
+    def _extract_implicit_context(self, text: AnalyzedText, context: Dict) -> Dict:
         """Extrai contexto implícito"""
         # Implementação simplificada
         implicit = {}
         
-        if "?" in text:
+        if "?" in text.raw:
             implicit["is_question"] = True
             implicit["question_type"] = self._classify_question(text)
         
-        if any(word in text.lower() for word in ["eu", "me", "minha", "meu"]):
+        if any(word in text.lower for word in PERSONAL_MARKERS):
             implicit["personal_perspective"] = True
         
-        if any(word in text.lower() for word in ["você", "te", "sua", "seu"]):
+        if any(word in text.lower for word in ADDRESS_MARKERS):
             implicit["direct_address"] = True
         
         # Mesclar com contexto explícito
@@ -350,54 +819,38 @@ class SplitBrainArchitecture:
         
         return implicit
     
-    def _generate_alternatives(self, text: str) -> List[str]:
+    def _generate_alternatives(self, text: AnalyzedText) -> List[str]:
         """Gera alternativas criativas"""
         # Placeholder - no futuro com modelo
+        preview = text.raw[:20]
         return [
-            f"Alternativa 1: Considerar perspectiva oposta sobre '{text[:20]}...'",
-            f"Alternativa 2: Explorar contexto mais amplo para '{text[:20]}...'",
-            f"Alternativa 3: Questionar suposições implícitas em '{text[:20]}...'"
+            f"Alternativa 1: Considerar perspectiva oposta sobre '{preview}...'",
+            f"Alternativa 2: Explorar contexto mais amplo para '{preview}...'",
+            f"Alternativa 3: Questionar suposições implícitas em '{preview}...'"
         ]
     
-    def _count_logical_connectors(self, text: str) -> Dict[str, int]:
+    def _count_logical_connectors(self, text: AnalyzedText) -> Dict[str, int]:
         """Conta conectores lógicos"""
-        connectors = {
-            "portanto": 0, "porque": 0, "contudo": 0,
-            "entretanto": 0, "além disso": 0, "no entanto": 0
-        }
-        
-        lower_text = text.lower()
-        
-        for connector in connectors:
-            connectors[connector] = lower_text.count(connector)
-        
-        return connectors
+        # Cópia: o resultado é exposto na saída e não deve alterar o AnalyzedText
+        return dict(text.connector_counts)
     
-    def _determine_structure_type(self, text: str) -> str:
+    def _determine_structure_type(self, text: AnalyzedText) -> str:
         """Determina tipo de estrutura lógica"""
-        if "?" in text:
+        if "?" in text.raw:
             return "questioning"
-        elif text.count('.') > 3:
+        elif text.period_count > 3:
             return "explanatory"
-        elif any(word in text.lower() for word in ["portanto", "conclusão"]):
+        elif any(word in text.lower for word in CONCLUSION_MARKERS):
             return "argumentative"
         else:
             return "descriptive"
     
-    def _classify_question(self, text: str) -> str:
+    def _classify_question(self, text: AnalyzedText) -> str:
         """Classifica tipo de pergunta"""
-        if "como" in text.lower():
-            return "process"
-        elif "por que" in text.lower():
-            return "cause"
-        elif "o que" in text.lower():
-            return "definition"
-        elif "quando" in text.lower():
-            return "time"
-        elif "onde" in text.lower():
-            return "location"
-        else:
-            return "general"
+        for marker, question_type in QUESTION_TYPES:
+            if marker in text.lower:
+                return question_type
+        return "general"
     
     def _get_timestamp(self) -> str:
         """Retorna timestamp atual"""
@@ -408,7 +861,9 @@ class SplitBrainArchitecture:
         """Gera recomendações baseadas na síntese"""
         recommendations = []
         
-        if not validation["valid"]:
+        if synthesis_data.get("degraded"):
+            recommendations.append("Resultado parcial: repetir a análise sem limite de tempo")
+        elif not validation["valid"]:
             recommendations.append("Revisar e resolver os conflitos identificados")
         
         if synthesis_data.get("recommended_approach") == "logical_first":
@@ -454,3 +909,5 @@ if __name__ == "__main__":
     print("\n🚀 PRÓXIMOS PASSOS:")
     for step in result['next_steps']:
         print(f"  {step}")
+    
+    split_brain.shutdown()
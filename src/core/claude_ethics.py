@@ -4,11 +4,704 @@
 Vetor 2: Ética profunda e proteção
 """
 
+import asyncio
+import hashlib
 import json
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import weakref
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, asdict
 from datetime import datetime
 
+# Regras padrão de red flags: {flag: [padrões]}
+DEFAULT_FLAG_PATTERNS: Dict[str, List[str]] = {
+    "self_harm": ["kill myself", "hurt myself", "want to die"],
+    "harm_to_others": ["hurt you", "kill them", "attack someone"],
+    "exploitation": ["send nudes", "meet alone", "keep secret"],
+    # ... outros patterns
+}
+
+# Palavras usadas para medir profundidade emocional
+EMOTIONAL_WORDS = ["love", "hate", "fear", "angry", "sad", "happy",
+                   "death", "loss", "trauma", "abuse", "violence"]
+
+# Palavras pesadas suavizadas para crianças abaixo de 12 anos
+HEAVY_EMOTIONAL_WORDS = ["trauma", "abuse", "violence", "death", "suicide"]
+HEAVY_EMOTIONAL_REPLACEMENT = "difficult situation"
+HEAVY_EMOTIONAL_MAX_AGE_LEVEL = 12
+
+# Adaptações por necessidade especial
+SPECIAL_NEEDS_REPLACEMENTS: Dict[str, Dict[str, str]] = {
+    "autism": {"maybe": "yes or no", "perhaps": ""},       # Clareza e estrutura
+    "dyslexia": {"however": "but", "therefore": "so"},     # Simplificação
+}
+SPECIAL_NEEDS_MAX_SENTENCES: Dict[str, int] = {
+    "adhd": 3,                                             # Brevidade e foco
+}
+
+def load_flag_rules(path: str) -> Dict[str, List[str]]:
+    """Carrega conjunto de regras {flag: [padrões]} de um arquivo JSON"""
+    with open(path, encoding="utf-8") as f:
+        rules = json.load(f)
+    
+    if not isinstance(rules, dict):
+        raise ValueError(f"Regras inválidas em {path}: esperado objeto {{flag: [padrões]}}")
+    
+    return {str(flag): [str(p) for p in patterns] for flag, patterns in rules.items()}
+
+@dataclass(frozen=True)
+class FlagHit:
+    flag: str
+    pattern: str
+    start: int
+    end: int
+
+# Até este número de padrões distintos, scan faz um str.find por padrão
+# (varredura em C); acima dele o autômato em Python, de custo independente
+# do número de padrões, fica mais rápido (ver benchmarks/bench_flag_matcher)
+SUBSTRING_SCAN_MAX_PATTERNS = 256
+
+class FlagMatcher:
+    """
+    Autômato Aho-Corasick para os padrões de red flags
+    Compilado uma vez, varre o conteúdo em uma única passada
+    Léxicos pequenos usam str.find por padrão em scan (mesmas ocorrências)
+    """
+    
+    def __init__(self, rules: Dict[str, List[str]]):
+        self.patterns: List[Tuple[str, str]] = []  # (flag, padrão normalizado)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self.depth: List[int] = [0]
+        
+        seen = set()
+        for flag, patterns in rules.items():
+            for pattern in patterns:
+                key = pattern.lower()
+                if not key or (flag, key) in seen:
+                    continue
+                seen.add((flag, key))
+                self._add_pattern(flag, key)
+        
+        self._build_failure_links()
+        
+        # Padrão normalizado -> ids (o mesmo padrão pode estar em várias flags)
+        self._substrings: Optional[Dict[str, List[int]]] = None
+        if 0 < len(self.patterns) <= SUBSTRING_SCAN_MAX_PATTERNS:
+            self._substrings = {}
+            for pattern_id, (_, pattern) in enumerate(self.patterns):
+                self._substrings.setdefault(pattern, []).append(pattern_id)
+    
+    def _add_pattern(self, flag: str, pattern: str):
+        """Insere padrão na trie"""
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self.depth.append(self.depth[state] + 1)
+                self._goto[state][char] = nxt
+            state = nxt
+        
+        self._out[state] += (len(self.patterns),)
+        self.patterns.append((flag, pattern))
+    
+    def _build_failure_links(self):
+        """Calcula links de falha em largura (BFS)"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+    
+    def step(self, state: int, char: str) -> int:
+        """Avança o autômato um caractere (já normalizado)"""
+        goto = self._goto
+        while True:
+            nxt = goto[state].get(char)
+            if nxt is not None:
+                return nxt
+            if state == 0:
+                return 0
+            state = self._fail[state]
+    
+    def scan(self, content: str) -> List[FlagHit]:
+        """Retorna todas as ocorrências de padrões, com offsets no conteúdo original"""
+        if self._substrings is None:
+            return self.feed(0, content)[1]
+        
+        lowered = content.lower()
+        found = []
+        for pattern, pattern_ids in self._substrings.items():
+            # Cada busca recomeça uma posição adiante: ocorrências sobrepostas contam
+            start = lowered.find(pattern)
+            while start != -1:
+                end = start + len(pattern)
+                found.extend((end, -len(pattern), pattern_id) for pattern_id in pattern_ids)
+                start = lowered.find(pattern, start + 1)
+        
+        if not found:
+            return []
+        
+        positions = None
+        if len(lowered) != len(content):
+            positions = [i for i, char in enumerate(content) for _ in char.lower()]
+        
+        # Mesma ordem do autômato: por fim, do padrão mais longo ao mais curto
+        hits = []
+        for end, neg_length, pattern_id in sorted(found):
+            flag, pattern = self.patterns[pattern_id]
+            start = end + neg_length
+            if positions is not None:
+                start, end = positions[start], positions[end - 1] + 1
+            hits.append(FlagHit(flag, pattern, start, end))
+        return hits
+    
+    def feed(self, state: int, text: str, offset: int = 0) -> Tuple[int, List[FlagHit]]:
+        """
+        Continua a varredura a partir de um estado (uso incremental)
+        
+        Args:
+            state: Estado retornado pela chamada anterior (0 no início)
+            text: Próximo trecho do conteúdo
+            offset: Posição de text no conteúdo completo
+        
+        Returns:
+            (novo estado, ocorrências terminadas neste trecho)
+        """
+        lowered = text.lower()
+        
+        # lower() pode expandir caracteres (ex: 'İ'); mapear de volta se necessário
+        positions = None
+        if len(lowered) != len(text):
+            positions = [i for i, char in enumerate(text) for _ in char.lower()]
+        
+        goto, fail, out = self._goto, self._fail, self._out
+        hits = []
+        
+        for i, char in enumerate(lowered):
+            while True:
+                nxt = goto[state].get(char)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            
+            for pattern_id in out[state]:
+                flag, pattern = self.patterns[pattern_id]
+                start, end = i + 1 - len(pattern), i + 1
+                if positions is not None:
+                    # Início em trecho anterior: assume lower() sem expansão lá
+                    start = positions[start] if start >= 0 else start
+                    end = positions[i] + 1
+                hits.append(FlagHit(flag, pattern, offset + start, offset + end))
+        
+        return state, hits
+
+# Formato binário do léxico compilado (ver compile_lexicon)
+LEXICON_MAGIC = b"NXLEXv1\0"
+LEXICON_SECTIONS = ("red_flags", "emotional_words", "heavy_emotional_words")
+
+def _lexicon_arrays(matcher: FlagMatcher) -> Tuple[Dict[str, array], bytes]:
+    """Converte o autômato em arrays planos (CSR) + blob de strings"""
+    n_states = len(matcher._goto)
+    arrays = {name: array("I") for name in (
+        "edge_start", "edge_chars", "edge_targets", "fail", "depth",
+        "out_start", "out_ids", "pattern_category", "pattern_char_len",
+        "pattern_str_start", "category_str_start"
+    )}
+    
+    for state in range(n_states):
+        arrays["edge_start"].append(len(arrays["edge_chars"]))
+        for code, target in sorted((ord(char), nxt) for char, nxt in matcher._goto[state].items()):
+            arrays["edge_chars"].append(code)
+            arrays["edge_targets"].append(target)
+        
+        arrays["out_start"].append(len(arrays["out_ids"]))
+        arrays["out_ids"].extend(matcher._out[state])
+    arrays["edge_start"].append(len(arrays["edge_chars"]))
+    arrays["out_start"].append(len(arrays["out_ids"]))
+    
+    arrays["fail"].extend(matcher._fail)
+    arrays["depth"].extend(matcher.depth)
+    
+    strings = bytearray()
+    categories: Dict[str, int] = {}
+    for flag, _ in matcher.patterns:
+        categories.setdefault(flag, len(categories))
+    for category in categories:
+        arrays["category_str_start"].append(len(strings))
+        strings += category.encode("utf-8")
+    arrays["category_str_start"].append(len(strings))
+    
+    for flag, pattern in matcher.patterns:
+        arrays["pattern_category"].append(categories[flag])
+        arrays["pattern_char_len"].append(len(pattern))
+        arrays["pattern_str_start"].append(len(strings))
+        strings += pattern.encode("utf-8")
+    arrays["pattern_str_start"].append(len(strings))
+    
+    return arrays, bytes(strings)
+
+def compile_lexicon(output_path: str, flag_rules: Dict[str, List[str]],
+                    emotional_words: List[str], heavy_emotional_words: List[str]):
+    """
+    Compila léxicos em um arquivo binário para ser mapeado em memória
+    
+    Args:
+        output_path: Arquivo de saída (.nxlex)
+        flag_rules: {flag: [padrões]} de red flags
+        emotional_words: Palavras de profundidade emocional
+        heavy_emotional_words: Palavras suavizadas para crianças pequenas
+    """
+    sources = {
+        "red_flags": flag_rules,
+        "emotional_words": {"emotional": emotional_words},
+        "heavy_emotional_words": {"heavy_emotional": heavy_emotional_words}
+    }
+    
+    directory = {"byteorder": sys.byteorder, "sections": {}}
+    chunks: List[bytes] = []
+    position = 0
+    
+    for name in LEXICON_SECTIONS:
+        arrays, strings = _lexicon_arrays(FlagMatcher(sources[name]))
+        entries = {}
+        for key, values in list(arrays.items()) + [("strings", strings)]:
+            data = values.tobytes() if isinstance(values, array) else values
+            entries[key] = [position, len(data)]
+            padding = -len(data) % 8  # Alinhamento para cast('I')
+            chunks.append(data + b"\0" * padding)
+            position += len(data) + padding
+        directory["sections"][name] = entries
+    
+    header = json.dumps(directory).encode("utf-8")
+    prefix = LEXICON_MAGIC + struct.pack("<I", len(header)) + header
+    prefix += b"\0" * (-len(prefix) % 8)
+    
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(prefix)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_path, output_path)
+
+def compile_lexicon_file(source_path: str, output_path: str):
+    """
+    Compila léxico a partir de JSON:
+    {"red_flags": {flag: [padrões]}, "emotional_words": [...], "heavy_emotional_words": [...]}
+    """
+    with open(source_path, encoding="utf-8") as f:
+        source = json.load(f)
+    
+    compile_lexicon(
+        output_path,
+        flag_rules=source.get("red_flags", DEFAULT_FLAG_PATTERNS),
+        emotional_words=source.get("emotional_words", EMOTIONAL_WORDS),
+        heavy_emotional_words=source.get("heavy_emotional_words", HEAVY_EMOTIONAL_WORDS)
+    )
+
+class MappedFlagMatcher:
+    """
+    Autômato Aho-Corasick lido diretamente do arquivo mapeado em memória
+    Mesma interface de FlagMatcher (scan, feed, step, depth)
+    
+    As transições de cada estado visitado são decodificadas uma vez para
+    um dict {caractere: estado}: a varredura fica próxima da do FlagMatcher
+    e a memória cresce só com os estados que o conteúdo realmente percorre
+    """
+    
+    def __init__(self, arrays: Dict[str, memoryview], strings: memoryview, mapping: Any = None):
+        # Mantém o mapeamento vivo enquanto o matcher estiver em uso
+        self._mapping = mapping
+        self._edge_start = arrays["edge_start"]
+        self._edge_chars = arrays["edge_chars"]
+        self._edge_targets = arrays["edge_targets"]
+        self._fail = arrays["fail"]
+        self._out_start = arrays["out_start"]
+        self._out_ids = arrays["out_ids"]
+        self._pattern_category = arrays["pattern_category"]
+        self._pattern_char_len = arrays["pattern_char_len"]
+        self._pattern_str_start = arrays["pattern_str_start"]
+        self._category_str_start = arrays["category_str_start"]
+        self._strings = strings
+        self.depth = arrays["depth"]
+        
+        # Poucas categorias; padrões são decodificados sob demanda
+        starts = self._category_str_start
+        self.categories = [bytes(strings[starts[i]:starts[i + 1]]).decode("utf-8")
+                           for i in range(len(starts) - 1)]
+        self._decoded: Dict[int, Tuple[str, str]] = {}
+        self._transitions: Dict[int, Dict[str, int]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._pattern_category)
+    
+    def _state_transitions(self, state: int) -> Dict[str, int]:
+        """Transições de um estado, decodificadas do CSR na primeira visita"""
+        lo, hi = self._edge_start[state], self._edge_start[state + 1]
+        transitions = {chr(code): target for code, target in
+                       zip(self._edge_chars[lo:hi], self._edge_targets[lo:hi])}
+        self._transitions[state] = transitions
+        return transitions
+    
+    def pattern(self, pattern_id: int) -> Tuple[str, str]:
+        """(flag, padrão) de um id de padrão"""
+        decoded = self._decoded.get(pattern_id)
+        if decoded is None:
+            start = self._pattern_str_start[pattern_id]
+            end = self._pattern_str_start[pattern_id + 1]
+            decoded = (self.categories[self._pattern_category[pattern_id]],
+                       bytes(self._strings[start:end]).decode("utf-8"))
+            self._decoded[pattern_id] = decoded
+        return decoded
+    
+    def pattern_strings(self) -> List[str]:
+        return [self.pattern(i)[1] for i in range(len(self))]
+    
+    def step(self, state: int, char: str) -> int:
+        """Avança o autômato um caractere (já normalizado)"""
+        while True:
+            transitions = self._transitions.get(state)
+            if transitions is None:
+                transitions = self._state_transitions(state)
+            nxt = transitions.get(char)
+            if nxt is not None:
+                return nxt
+            if state == 0:
+                return 0
+            state = self._fail[state]
+    
+    def scan(self, content: str) -> List[FlagHit]:
+        """Retorna todas as ocorrências de padrões, com offsets no conteúdo original"""
+        return self.feed(0, content)[1]
+    
+    def feed(self, state: int, text: str, offset: int = 0) -> Tuple[int, List[FlagHit]]:
+        """Continua a varredura a partir de um estado (ver FlagMatcher.feed)"""
+        lowered = text.lower()
+        
+        positions = None
+        if len(lowered) != len(text):
+            positions = [i for i, char in enumerate(text) for _ in char.lower()]
+        
+        cached, decode = self._transitions, self._state_transitions
+        fail, out_start, out_ids = self._fail, self._out_start, self._out_ids
+        hits = []
+        
+        for i, char in enumerate(lowered):
+            while True:
+                transitions = cached.get(state)
+                if transitions is None:
+                    transitions = decode(state)
+                nxt = transitions.get(char)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            
+            first, last = out_start[state], out_start[state + 1]
+            if first == last:
+                continue
+            for index in range(first, last):
+                pattern_id = out_ids[index]
+                flag, pattern = self.pattern(pattern_id)
+                start, end = i + 1 - self._pattern_char_len[pattern_id], i + 1
+                if positions is not None:
+                    start = positions[start] if start >= 0 else start
+                    end = positions[i] + 1
+                hits.append(FlagHit(flag, pattern, offset + start, offset + end))
+        
+        return state, hits
+
+class _Mapping:
+    """
+    Arquivo + mmap + views de um léxico compilado
+    Liberado quando a última referência (léxico ou matcher) desaparece
+    """
+    
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.views: List[memoryview] = []
+        self._finalizer = weakref.finalize(self, _release_mapping,
+                                           self.views, self.mmap, self.file)
+    
+    def close(self):
+        self._finalizer()
+
+def _release_mapping(views: List[memoryview], mapped: mmap.mmap, file) -> None:
+    # Todas as views precisam ser liberadas antes de fechar o mmap
+    for view in reversed(views):
+        view.release()
+    views.clear()
+    mapped.close()
+    file.close()
+
+class MappedLexicon:
+    """
+    Léxico compilado aberto via mmap
+    Processos que abrem o mesmo arquivo compartilham as páginas; o custo
+    de abertura não depende do tamanho do léxico
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.matchers: Dict[str, MappedFlagMatcher] = {}
+        self._mapping = _Mapping(path)
+        self._mmap = self._mapping.mmap
+        
+        if self._mmap[:len(LEXICON_MAGIC)] != LEXICON_MAGIC:
+            self.close()
+            raise ValueError(f"Arquivo de léxico inválido: {path}")
+        
+        header_start = len(LEXICON_MAGIC) + 4
+        (header_len,) = struct.unpack_from("<I", self._mmap, len(LEXICON_MAGIC))
+        directory = json.loads(self._mmap[header_start:header_start + header_len])
+        
+        if directory["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError(f"Léxico compilado com byteorder {directory['byteorder']}")
+        
+        data_start = header_start + header_len
+        data_start += -data_start % 8
+        
+        views_in_use = self._mapping.views
+        views_in_use.append(memoryview(self._mmap))
+        for name, entries in directory["sections"].items():
+            views = {key: views_in_use[0][data_start + start:data_start + start + size]
+                     for key, (start, size) in entries.items()}
+            strings = views.pop("strings")
+            arrays = {key: view.cast("I") for key, view in views.items()}
+            views_in_use.extend(views.values())
+            views_in_use.extend(arrays.values())
+            views_in_use.append(strings)
+            self.matchers[name] = MappedFlagMatcher(arrays, strings, self._mapping)
+    
+    def matcher(self, section: str) -> MappedFlagMatcher:
+        return self.matchers[section]
+    
+    def close(self):
+        """
+        Libera o mapeamento imediatamente (matchers deixam de ser utilizáveis)
+        Sem close, ele é liberado quando o léxico e todos os matchers saem de uso
+        """
+        self.matchers = {}
+        self._mapping.close()
+
+class ContentRewriter:
+    """Substituição de várias palavras em uma única passada (regex combinada)"""
+    
+    def __init__(self, replacements: Dict[str, str]):
+        self.replacements = dict(replacements)
+        self._pattern = None
+        if self.replacements:
+            # Mais longos primeiro para preferir a ocorrência mais longa
+            keys = sorted(self.replacements, key=len, reverse=True)
+            self._pattern = re.compile("|".join(re.escape(key) for key in keys))
+    
+    def rewrite(self, content: str) -> str:
+        if self._pattern is None:
+            return content
+        replacements = self.replacements
+        return self._pattern.sub(lambda match: replacements[match.group()], content)
+
+@dataclass(frozen=True)
+class AgePolicy:
+    """Política compilada para (nível de idade, necessidades especiais)"""
+    age_level: int
+    special_needs: FrozenSet[str]
+    max_complexity: int
+    emotional_depth: int
+    needs_rewriter: ContentRewriter
+    emotional_rewriter: ContentRewriter  # Tom emocional + necessidades especiais
+    max_sentences: Optional[int]
+    
+    def adapt(self, content: str, emotional: bool = False,
+              sentences: Optional[List[str]] = None) -> str:
+        """
+        Aplica as reescritas da política em uma única passada
+        
+        Args:
+            content: Texto a adaptar
+            emotional: Também suavizar palavras emocionalmente pesadas
+            sentences: content.split('.') já calculado, se disponível
+        """
+        rewriter = self.emotional_rewriter if emotional else self.needs_rewriter
+        adapted = rewriter.rewrite(content)
+        
+        if self.max_sentences is not None:
+            # As substituições não alteram '.', a segmentação continua válida
+            if sentences is None or adapted != content:
+                sentences = adapted.split('.')
+            if len(sentences) > self.max_sentences:
+                adapted = '. '.join(sentences[:self.max_sentences])
+        
+        return adapted
+
+class VerdictCache:
+    """Cache LRU com TTL opcional para veredictos de safety_check"""
+    
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_entries <= 0:
+            raise ValueError("max_entries deve ser positivo")
+        
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple, Tuple[Optional[float], Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Tuple) -> Optional[Dict]:
+        """Retorna o veredicto cacheado ou None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            expires_at, verdict = entry
+            if expires_at is not None and self._clock() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return verdict
+    
+    def put(self, key: Tuple, verdict: Dict):
+        """Armazena veredicto, removendo o menos recente se cheio"""
+        expires_at = self._clock() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, verdict)
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de uso do cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+class LatencyHistogram:
+    """Histograma de latências (segundos) com buckets fixos"""
+    
+    BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+               0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+    
+    def __init__(self):
+        self.bucket_counts = [0] * (len(self.BUCKETS) + 1)  # Último = +Inf
+        self.count = 0
+        self.total = 0.0
+    
+    def observe(self, seconds: float):
+        self.bucket_counts[bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "buckets": {str(bound): n for bound, n in zip(self.BUCKETS, self.bucket_counts)},
+            "overflow": self.bucket_counts[-1]
+        }
+
+class StageMetrics:
+    """Latência por etapa de safety_check, exportável em JSON ou Prometheus"""
+    
+    STAGES = ("preprocess", "red_flag_scan", "complexity", "emotional_depth", "special_needs")
+    METRIC_NAME = "nexus_safety_check_stage_seconds"
+    
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.histograms = {stage: LatencyHistogram() for stage in self.STAGES}
+    
+    def lap(self, stage: str, started: float) -> float:
+        """Registra o tempo desde started na etapa e retorna o instante atual"""
+        now = self.clock()
+        self.histograms[stage].observe(now - started)
+        return now
+    
+    def reset(self):
+        self.histograms = {stage: LatencyHistogram() for stage in self.STAGES}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {stage: histogram.to_dict() for stage, histogram in self.histograms.items()}
+    
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+    
+    def to_prometheus(self) -> str:
+        """Formato de exposição texto do Prometheus (buckets cumulativos)"""
+        name = self.METRIC_NAME
+        lines = [
+            f"# HELP {name} Latência por etapa de safety_check",
+            f"# TYPE {name} histogram"
+        ]
+        
+        for stage, histogram in self.histograms.items():
+            cumulative = 0
+            for bound, n in zip(histogram.BUCKETS, histogram.bucket_counts):
+                cumulative += n
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.total}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+        
+        return "\n".join(lines) + "\n"
+
 @dataclass
 class ChildContext:
     age: int
@@ -17,10 +710,377 @@ class ChildContext:
     special_needs: List[str]
     guardians: List[str]
 
+@dataclass
+class AnalyzedContent:
+    """Pré-processamento de um documento, compartilhado entre as verificações"""
+    content: str
+    lowered: str
+    words: List[str]
+    sentences: List[str]
+    sentence_word_counts: List[int]
+    flag_hits: List[FlagHit]
+
+class StreamAborted(Exception):
+    """Stream interrompido ao detectar red flag"""
+    
+    def __init__(self, hits: List[FlagHit]):
+        self.hits = hits
+        flags = sorted({hit.flag for hit in hits})
+        super().__init__(f"Stream interrompido por red flag: {', '.join(flags)}")
+
+class EthicsStreamScreener:
+    """
+    Triagem incremental da saída do modelo, chunk a chunk
+    Mantém o estado do matcher entre chunks e só libera o texto que
+    não pode mais fazer parte de um padrão em andamento
+    """
+    
+    def __init__(self, ethics: "ClaudeEthicalOverride", context: ChildContext,
+                 abort_on_flag: bool = True,
+                 on_flag: Optional[Callable[[List[FlagHit]], None]] = None):
+        self.ethics = ethics
+        self.context = context
+        self.abort_on_flag = abort_on_flag
+        self.on_flag = on_flag
+        
+        self.hits: List[FlagHit] = []
+        self.aborted = False
+        self._matcher = ethics.flag_matcher
+        self._state = 0
+        self._offset = 0
+        self._chunks: List[str] = []
+        self._pending = ""
+    
+    @property
+    def flagged(self) -> bool:
+        return bool(self.hits)
+    
+    def feed(self, chunk: str) -> str:
+        """
+        Processa um chunk do stream
+        
+        Returns:
+            Texto liberado para exibição (pode ser vazio)
+        
+        Raises:
+            StreamAborted: red flag detectada com abort_on_flag=True
+        """
+        if self.aborted:
+            raise StreamAborted(self.hits)
+        
+        self._state, hits = self._matcher.feed(self._state, chunk, self._offset)
+        self._offset += len(chunk)
+        self._chunks.append(chunk)
+        self._pending += chunk
+        
+        if hits:
+            self.hits.extend(hits)
+            if self.on_flag is not None:
+                self.on_flag(hits)
+            if self.abort_on_flag:
+                self.aborted = True
+                self._pending = ""
+                raise StreamAborted(self.hits)
+        
+        # Reter apenas o sufixo que ainda pode completar um padrão
+        hold = min(self._matcher.depth[self._state], len(self._pending))
+        release = self._pending[:len(self._pending) - hold]
+        self._pending = self._pending[len(release):]
+        return release
+    
+    def finish(self) -> Dict:
+        """
+        Encerra o stream e executa a verificação completa do texto
+        O resultado inclui "released_tail" com o texto ainda retido
+        """
+        if self.aborted:
+            raise StreamAborted(self.hits)
+        
+        content = "".join(self._chunks)
+        doc = self.ethics.analyze_content(content, flag_hits=self.hits)
+        result = self.ethics._check_analyzed(doc, self.context)
+        
+        result["released_tail"] = self._pending
+        self._pending = ""
+        return result
+
+class SafetySession:
+    """
+    Estado de segurança acumulado de uma conversa com uma criança
+    Cada turno custa apenas o próprio tamanho; memória limitada
+    """
+    
+    SNAPSHOT_VERSION = 1
+    
+    def __init__(self, ethics: "ClaudeEthicalOverride", context: ChildContext,
+                 max_flag_history: int = 100):
+        self.ethics = ethics
+        self.context = context
+        
+        self.turns = 0
+        self.emotional_word_counts: Dict[str, int] = {}  # Turnos em que cada palavra apareceu
+        self.flag_counts: Dict[str, int] = {}
+        self.flag_history: deque = deque(maxlen=max_flag_history)
+        
+        # Estatísticas de tamanho de sentença (Welford)
+        self.sentence_count = 0
+        self.sentence_length_mean = 0.0
+        self.sentence_length_m2 = 0.0
+        self.sentence_length_max = 0
+    
+    def add_turn(self, content: str) -> Dict:
+        """
+        Verifica um novo turno e atualiza o estado da conversa
+        
+        Returns:
+            {"turn": n, "verdict": resultado do turno, "conversation": avaliação acumulada}
+        """
+        doc = self.ethics.analyze_content(content)
+        verdict = self.ethics._check_analyzed(doc, self.context)
+        self.turns += 1
+        
+        for length in doc.sentence_word_counts:
+            self.sentence_count += 1
+            delta = length - self.sentence_length_mean
+            self.sentence_length_mean += delta / self.sentence_count
+            self.sentence_length_m2 += delta * (length - self.sentence_length_mean)
+            self.sentence_length_max = max(self.sentence_length_max, length)
+        
+        for word in self.ethics._emotional_words_in(doc):
+            self.emotional_word_counts[word] = self.emotional_word_counts.get(word, 0) + 1
+        
+        for hit in doc.flag_hits:
+            self.flag_counts[hit.flag] = self.flag_counts.get(hit.flag, 0) + 1
+            self.flag_history.append({"turn": self.turns, **asdict(hit)})
+        
+        return {
+            "turn": self.turns,
+            "verdict": verdict,
+            "conversation": self.assessment()
+        }
+    
+    def assessment(self) -> Dict:
+        """Avaliação da conversa inteira a partir dos contadores"""
+        policy = self.ethics.get_policy(self.context)
+        complexity = self.ethics._complexity_level(self.sentence_length_mean)
+        emotional_depth = self.ethics._emotional_depth_level(len(self.emotional_word_counts))
+        
+        flags = [flag for flag in self.ethics.red_flags if flag in self.flag_counts]
+        if complexity > policy.max_complexity:
+            flags.append("age_inappropriate")
+        if emotional_depth > policy.emotional_depth:
+            flags.append("emotionally_inappropriate")
+        
+        variance = self.sentence_length_m2 / self.sentence_count if self.sentence_count else 0.0
+        
+        return {
+            "safe": len(flags) == 0,
+            "flags": flags,
+            "turns": self.turns,
+            "complexity": complexity,
+            "emotional_depth": emotional_depth,
+            "sentence_length": {
+                "count": self.sentence_count,
+                "mean": self.sentence_length_mean,
+                "std": variance ** 0.5,
+                "max": self.sentence_length_max
+            },
+            "emotional_words": dict(self.emotional_word_counts),
+            "flag_counts": dict(self.flag_counts),
+            "age_appropriate_level": policy.age_level
+        }
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado serializável em JSON para persistir a sessão"""
+        return {
+            "version": self.SNAPSHOT_VERSION,
+            "turns": self.turns,
+            "emotional_word_counts": dict(self.emotional_word_counts),
+            "flag_counts": dict(self.flag_counts),
+            "flag_history": list(self.flag_history),
+            "max_flag_history": self.flag_history.maxlen,
+            "sentence_count": self.sentence_count,
+            "sentence_length_mean": self.sentence_length_mean,
+            "sentence_length_m2": self.sentence_length_m2,
+            "sentence_length_max": self.sentence_length_max
+        }
+    
+    @classmethod
+    def restore(cls, ethics: "ClaudeEthicalOverride", context: ChildContext,
+                snapshot: Dict[str, Any]) -> "SafetySession":
+        """Recria a sessão a partir de snapshot()"""
+        if snapshot.get("version") != cls.SNAPSHOT_VERSION:
+            raise ValueError(f"Versão de snapshot não suportada: {snapshot.get('version')}")
+        
+        session = cls(ethics, context, max_flag_history=snapshot["max_flag_history"])
+        session.turns = snapshot["turns"]
+        session.emotional_word_counts = dict(snapshot["emotional_word_counts"])
+        session.flag_counts = dict(snapshot["flag_counts"])
+        session.flag_history.extend(snapshot["flag_history"])
+        session.sentence_count = snapshot["sentence_count"]
+        session.sentence_length_mean = snapshot["sentence_length_mean"]
+        session.sentence_length_m2 = snapshot["sentence_length_m2"]
+        session.sentence_length_max = snapshot["sentence_length_max"]
+        return session
+
+# Instância por processo usada pelos pools (lote e async)
+_worker_ethics: Optional["ClaudeEthicalOverride"] = None
+
+def _init_worker(init_kwargs: Dict[str, Any]):
+    """Inicializa a instância do worker uma única vez por processo"""
+    global _worker_ethics
+    _worker_ethics = ClaudeEthicalOverride(**init_kwargs)
+
+def _check_batch_chunk(chunk: List[Tuple[str, ChildContext]]) -> List[Dict]:
+    """Executa um bloco do lote dentro do worker"""
+    return _worker_ethics._check_items(chunk)
+
+def _check_single(content: str, context: ChildContext) -> Dict:
+    """Executa uma verificação dentro do worker"""
+    return _worker_ethics.safety_check(content, context)
+
+def _worker_ready() -> bool:
+    return _worker_ethics is not None
+
+class EthicsPoolFull(Exception):
+    """Fila do pool cheia com reject_when_full=True"""
+
+class EthicsPoolRetired(Exception):
+    """Pool aposentado após troca de regras; o pedido não chegou a ser enfileirado"""
+
+class EthicsWorkerPool:
+    """
+    Pool de processos com instâncias ClaudeEthicalOverride pré-aquecidas
+    para chamadas async. A fila é limitada: acima de max_pending as
+    chamadas aguardam (backpressure) ou são rejeitadas
+    
+    Ao trocar as regras o pool é aposentado (retire): quem já chamou submit
+    termina nele, e os processos são encerrados quando o último sai
+    """
+    
+    def __init__(self, init_kwargs: Dict[str, Any], workers: Optional[int] = None,
+                 max_pending: Optional[int] = None, reject_when_full: bool = False):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        self.reject_when_full = reject_when_full
+        
+        self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                             initializer=_init_worker,
+                                             initargs=(init_kwargs,))
+        # Um semáforo por event loop: asyncio.Semaphore fica preso ao loop
+        # em que foi usado, e o pool pode atender vários asyncio.run
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary())
+        self._lock = threading.Lock()
+        self._callers = 0
+        self._retired = False
+        
+        self.pending = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.rejected = 0
+    
+    def warm_up(self):
+        """Inicia todos os processos e constrói suas instâncias antes do primeiro pedido"""
+        futures = [self._executor.submit(_worker_ready) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+    
+    def _loop_slots(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        with self._lock:
+            slots = self._slots.get(loop)
+            if slots is None:
+                slots = self._slots[loop] = asyncio.Semaphore(self.max_pending)
+            return slots
+    
+    def _track(self, job: Future, loop: asyncio.AbstractEventLoop, slots: asyncio.Semaphore):
+        """O slot só é liberado quando o job termina no worker, não quando o chamador desiste"""
+        with self._lock:
+            self.pending += 1
+        
+        def finished(_):
+            with self._lock:
+                self.pending -= 1
+            try:
+                loop.call_soon_threadsafe(slots.release)
+            except RuntimeError:
+                pass  # Loop já encerrado: ninguém mais espera por este semáforo
+        
+        job.add_done_callback(finished)
+    
+    async def submit(self, content: str, context: ChildContext) -> Dict:
+        """Envia uma verificação ao pool; cancelar a task cancela o pedido na fila"""
+        loop = asyncio.get_running_loop()
+        slots = self._loop_slots(loop)
+        
+        if self.reject_when_full and slots.locked():
+            self.rejected += 1
+            raise EthicsPoolFull(f"Pool com {self.max_pending} pedidos pendentes")
+        
+        with self._lock:
+            if self._retired:
+                raise EthicsPoolRetired()
+            self._callers += 1
+        
+        try:
+            await slots.acquire()
+            try:
+                job = self._executor.submit(_check_single, content, context)
+            except BaseException:
+                slots.release()
+                raise
+            self._track(job, loop, slots)
+            
+            try:
+                result = await asyncio.wrap_future(job)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+        finally:
+            with self._lock:
+                self._callers -= 1
+                last = self._retired and self._callers == 0
+            if last:
+                self._executor.shutdown(wait=False)
+        
+        self.completed += 1
+        return result
+    
+    def retire(self):
+        """Recusa novos pedidos e encerra os processos quando os atuais terminarem"""
+        with self._lock:
+            self._retired = True
+            idle = self._callers == 0
+        if idle:
+            self._executor.shutdown(wait=False)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected
+        }
+    
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        """Encerra o pool; por padrão os pedidos já enfileirados terminam"""
+        with self._lock:
+            self._retired = True
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+    
+    async def shutdown_async(self, cancel_futures: bool = False):
+        """shutdown(wait=True) sem bloquear o event loop"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, partial(self.shutdown, True, cancel_futures))
+
 class ClaudeEthicalOverride:
     """Sistema de override ético inspirado no Claude"""
     
-    def __init__(self):
+    def __init__(self, flag_rules: Optional[Dict[str, List[str]]] = None,
+                 verdict_cache_size: int = 0, verdict_cache_ttl: Optional[float] = None,
+                 lexicon_path: Optional[str] = None):
         self.ethical_principles = {
             "first_do_no_harm": 10,
             "respect_autonomy": 9,
@@ -43,37 +1103,366 @@ class ClaudeEthicalOverride:
             15: {"max_complexity": 5, "emotional_depth": 5},
             18: {"max_complexity": 6, "emotional_depth": 6}
         }
+        
+        # Tabela idade -> nível e políticas compiladas sob demanda
+        self._compile_age_table()
+        self._policies: Dict[Tuple[int, FrozenSet[str]], AgePolicy] = {}
+        
+        # Cache opcional de veredictos (desligado com tamanho 0)
+        self.verdict_cache: Optional[VerdictCache] = None
+        if verdict_cache_size > 0:
+            self.verdict_cache = VerdictCache(verdict_cache_size, verdict_cache_ttl)
+        self._rules_version = 0
+        
+        # Pool de processos para safety_check_async (criado sob demanda)
+        self._async_pool: Optional[EthicsWorkerPool] = None
+        
+        # Instrumentação por etapa (desligada: custo de um teste de None)
+        self.stage_metrics: Optional[StageMetrics] = None
+        
+        # Léxicos emocionais (listas padrão ou arquivo compilado)
+        self.lexicon: Optional[MappedLexicon] = None
+        self.lexicon_path: Optional[str] = None
+        self.emotional_matcher: Optional[MappedFlagMatcher] = None
+        self.heavy_emotional_words = list(HEAVY_EMOTIONAL_WORDS)
+        if lexicon_path is not None:
+            self.load_lexicon(lexicon_path)
+        
+        # Matcher compilado uma única vez a partir do conjunto de regras
+        # (regras explícitas têm prioridade sobre as red flags do léxico)
+        if flag_rules is not None or lexicon_path is None:
+            self.load_rules(DEFAULT_FLAG_PATTERNS if flag_rules is None else flag_rules)
+    
+    @classmethod
+    def from_rules_file(cls, path: str) -> "ClaudeEthicalOverride":
+        """Cria instância com regras de red flags carregadas de JSON"""
+        return cls(flag_rules=load_flag_rules(path))
+    
+    def load_rules(self, flag_rules: Dict[str, List[str]]):
+        """Substitui o conjunto de regras e recompila o matcher"""
+        self.flag_rules = {flag: list(patterns) for flag, patterns in flag_rules.items()}
+        
+        for flag in self.flag_rules:
+            if flag not in self.red_flags:
+                self.red_flags.append(flag)
+        
+        self.flag_matcher = FlagMatcher(self.flag_rules)
+        self._rules_changed()
+    
+    def load_lexicon(self, path: str):
+        """
+        Mapeia em memória um léxico compilado por compile_lexicon
+        Substitui red flags, palavras emocionais e palavras pesadas
+        """
+        # Tudo é preparado antes da troca; o léxico antigo não é fechado porque
+        # screeners, sessões e threads podem ainda usar seus matchers — o
+        # mapeamento é liberado quando a última referência desaparece
+        lexicon = MappedLexicon(path)
+        flag_matcher = lexicon.matcher("red_flags")
+        emotional_matcher = lexicon.matcher("emotional_words")
+        heavy_emotional_words = lexicon.matcher("heavy_emotional_words").pattern_strings()
+        red_flags = self.red_flags + [flag for flag in flag_matcher.categories
+                                      if flag not in self.red_flags]
+        
+        (self.lexicon, self.lexicon_path, self.flag_rules, self.flag_matcher,
+         self.emotional_matcher, self.heavy_emotional_words, self.red_flags) = (
+            lexicon, path, None, flag_matcher,
+            emotional_matcher, heavy_emotional_words, red_flags)
+        
+        self._policies.clear()
+        self._rules_changed()
+    
+    def _rules_changed(self):
+        """Veredictos anteriores deixam de valer com as novas regras"""
+        self._rules_version += 1
+        if self.verdict_cache is not None:
+            self.verdict_cache.clear()
+        
+        # Workers foram criados com as regras antigas: pedidos já aceitos
+        # terminam no pool antigo, os novos vão para um pool novo
+        pool = getattr(self, "_async_pool", None)
+        if pool is not None:
+            self._async_pool = None
+            pool.retire()
+    
+    def enable_instrumentation(self, metrics: Optional[StageMetrics] = None) -> StageMetrics:
+        """Liga a medição de latência por etapa de safety_check"""
+        self.stage_metrics = metrics if metrics is not None else StageMetrics()
+        return self.stage_metrics
+    
+    def disable_instrumentation(self):
+        self.stage_metrics = None
+    
+    def _compile_age_table(self):
+        """Pré-calcula o nível de idade para cada idade até o maior limite"""
+        thresholds = sorted(self.age_appropriate.keys())
+        self._age_table = [next(t for t in thresholds if age <= t)
+                           for age in range(thresholds[-1] + 1)]
+    
+    def get_policy(self, context: ChildContext) -> AgePolicy:
+        """Retorna a política compilada para o contexto (cacheada após o primeiro uso)"""
+        age_level = self._get_age_level(context.age)
+        needs = frozenset(need for need in context.special_needs
+                          if need in SPECIAL_NEEDS_REPLACEMENTS
+                          or need in SPECIAL_NEEDS_MAX_SENTENCES)
+        
+        key = (age_level, needs)
+        policy = self._policies.get(key)
+        if policy is None:
+            policy = self._policies[key] = self._compile_policy(age_level, needs)
+        return policy
+    
+    def _compile_policy(self, age_level: int, needs: FrozenSet[str]) -> AgePolicy:
+        """Compila limites e reescritas para uma combinação de idade e necessidades"""
+        # Ordem das necessidades fixa para resultado determinístico
+        needs_replacements: Dict[str, str] = {}
+        for need, replacements in SPECIAL_NEEDS_REPLACEMENTS.items():
+            if need in needs:
+                needs_replacements.update(replacements)
+        
+        emotional_replacements: Dict[str, str] = {}
+        if age_level < HEAVY_EMOTIONAL_MAX_AGE_LEVEL:
+            emotional_replacements = {word: HEAVY_EMOTIONAL_REPLACEMENT
+                                      for word in self.heavy_emotional_words}
+        emotional_replacements.update(needs_replacements)
+        
+        sentence_limits = [limit for need, limit in SPECIAL_NEEDS_MAX_SENTENCES.items()
+                           if need in needs]
+        
+        limits = self.age_appropriate[age_level]
+        return AgePolicy(
+            age_level=age_level,
+            special_needs=needs,
+            max_complexity=limits["max_complexity"],
+            emotional_depth=limits["emotional_depth"],
+            needs_rewriter=ContentRewriter(needs_replacements),
+            emotional_rewriter=ContentRewriter(emotional_replacements),
+            max_sentences=min(sentence_limits) if sentence_limits else None
+        )
+    
+    def scan_flags(self, content: str) -> List[FlagHit]:
+        """Retorna todas as ocorrências de red flags com offsets"""
+        return self.flag_matcher.scan(content)
+    
+    def analyze_content(self, content: str,
+                        flag_hits: Optional[List[FlagHit]] = None) -> AnalyzedContent:
+        """Tokeniza o documento uma única vez para todas as verificações"""
+        metrics = self.stage_metrics
+        started = metrics.clock() if metrics is not None else 0.0
+        
+        if flag_hits is None:
+            flag_hits = self.flag_matcher.scan(content)
+            if metrics is not None:
+                started = metrics.lap("red_flag_scan", started)
+        
+        sentences = content.split('.')
+        doc = AnalyzedContent(
+            content=content,
+            lowered=content.lower(),
+            words=content.split(),
+            sentences=sentences,
+            sentence_word_counts=[len(s.split()) for s in sentences],
+            flag_hits=flag_hits
+        )
+        
+        if metrics is not None:
+            metrics.lap("preprocess", started)
+        return doc
     
     def safety_check(self, content: str, context: ChildContext) -> Dict:
         """
         Verificação de segurança completa
         Retorna dict com {safe: bool, flags: list, adjusted_content: str}
         """
+        return self._check_cached(content, context, self.analyze_content)
+    
+    def _verdict_key(self, content: str, policy: AgePolicy) -> Tuple:
+        """Chave do cache: versão das regras, digest do conteúdo e perfil da política"""
+        digest = hashlib.sha256(content.encode("utf-8", "surrogatepass")).digest()
+        return (self._rules_version, digest, policy.age_level, policy.special_needs)
+    
+    def _check_cached(self, content: str, context: ChildContext,
+                      analyze: Callable[[str], AnalyzedContent]) -> Dict:
+        """Consulta o cache de veredictos antes de analisar o conteúdo"""
+        cache = self.verdict_cache
+        if cache is None:
+            return self._check_analyzed(analyze(content), context)
+        
+        key = self._verdict_key(content, self.get_policy(context))
+        verdict = cache.get(key)
+        if verdict is None:
+            verdict = self._check_analyzed(analyze(content), context)
+            cache.put(key, verdict)
+        
+        # Cópia para o chamador, com timestamp atual
+        return dict(verdict,
+                    flags=list(verdict["flags"]),
+                    flag_hits=[dict(hit) for hit in verdict["flag_hits"]],
+                    timestamp=datetime.now().isoformat())
+    
+    def stream_screener(self, context: ChildContext, abort_on_flag: bool = True,
+                        on_flag: Optional[Callable[[List[FlagHit]], None]] = None
+                        ) -> EthicsStreamScreener:
+        """Cria triagem incremental para uma resposta em streaming"""
+        return EthicsStreamScreener(self, context, abort_on_flag, on_flag)
+    
+    def screen_stream(self, chunks: Iterable[str], context: ChildContext) -> Iterator[str]:
+        """
+        Filtra um stream de chunks, liberando texto assim que seguro
+        Levanta StreamAborted na primeira red flag
+        """
+        screener = self.stream_screener(context)
+        for chunk in chunks:
+            released = screener.feed(chunk)
+            if released:
+                yield released
+        
+        tail = screener.finish()["released_tail"]
+        if tail:
+            yield tail
+    
+    def configure_async_pool(self, workers: Optional[int] = None,
+                             max_pending: Optional[int] = None,
+                             reject_when_full: bool = False,
+                             warm_up: bool = True) -> EthicsWorkerPool:
+        """
+        Configura o pool de processos usado por safety_check_async
+        
+        Args:
+            workers: Número de processos (padrão: núcleos disponíveis)
+            max_pending: Pedidos em andamento + na fila (padrão: 4 por worker)
+            reject_when_full: Levantar EthicsPoolFull em vez de aguardar
+            warm_up: Criar os workers e suas instâncias imediatamente
+        """
+        previous, self._async_pool = self._async_pool, None
+        if previous is not None:
+            previous.retire()
+        self._async_pool = EthicsWorkerPool(self._worker_init_kwargs(), workers,
+                                            max_pending, reject_when_full)
+        if warm_up:
+            self._async_pool.warm_up()
+        return self._async_pool
+    
+    async def safety_check_async(self, content: str, context: ChildContext) -> Dict:
+        """safety_check executado no pool de processos, sem bloquear o event loop"""
+        while True:
+            pool = self._async_pool
+            if pool is None:
+                pool = self.configure_async_pool(warm_up=False)
+            try:
+                return await pool.submit(content, context)
+            except EthicsPoolRetired:
+                continue  # Regras trocadas entre a leitura do pool e o envio
+    
+    def close_async_pool(self, wait: bool = True):
+        """Encerra o pool async; pedidos já enfileirados terminam"""
+        pool, self._async_pool = self._async_pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+    
+    async def close_async_pool_async(self):
+        """close_async_pool(wait=True) sem bloquear o event loop"""
+        pool, self._async_pool = self._async_pool, None
+        if pool is not None:
+            await pool.shutdown_async()
+    
+    def start_session(self, context: ChildContext, max_flag_history: int = 100) -> SafetySession:
+        """Cria estado incremental de segurança para uma conversa"""
+        return SafetySession(self, context, max_flag_history)
+    
+    def safety_check_batch(self, items: Iterable[Tuple[str, ChildContext]],
+                           workers: int = 1, chunk_size: int = 64) -> List[Dict]:
+        """
+        Verificação de segurança em lote
+        
+        Args:
+            items: Pares (conteúdo, contexto)
+            workers: Processos a usar; 1 executa no processo atual
+            chunk_size: Itens por tarefa enviada ao pool
+        
+        Returns:
+            Resultados na mesma ordem de items
+        """
+        items = list(items)
+        
+        if workers <= 1 or len(items) <= chunk_size:
+            return self._check_items(items)
+        
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        results = []
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(self._worker_init_kwargs(),)) as pool:
+            for chunk_results in pool.map(_check_batch_chunk, chunks):
+                results.extend(chunk_results)
+        
+        return results
+    
+    def _worker_init_kwargs(self) -> Dict[str, Any]:
+        """Argumentos para recriar esta instância em um processo worker"""
+        cache = self.verdict_cache
+        return {
+            "flag_rules": self.flag_rules,
+            "lexicon_path": self.lexicon_path,
+            "verdict_cache_size": cache.max_entries if cache is not None else 0,
+            "verdict_cache_ttl": cache.ttl if cache is not None else None
+        }
+    
+    def _check_items(self, items: List[Tuple[str, ChildContext]]) -> List[Dict]:
+        """Verifica itens reaproveitando a análise de conteúdos repetidos"""
+        analyzed: Dict[str, AnalyzedContent] = {}
+        
+        def analyze(content: str) -> AnalyzedContent:
+            doc = analyzed.get(content)
+            if doc is None:
+                doc = analyzed[content] = self.analyze_content(content)
+            return doc
+        
+        return [self._check_cached(content, context, analyze) for content, context in items]
+    
+    def _check_analyzed(self, doc: AnalyzedContent, context: ChildContext) -> Dict:
+        """Executa as verificações sobre um documento já pré-processado"""
+        content = doc.content
         flags = []
         adjusted = content
         
-        # 1. Check red flags
-        for flag in self.red_flags:
-            if self._contains_flag(content, flag):
-                flags.append(flag)
+        metrics = self.stage_metrics
+        started = metrics.clock() if metrics is not None else 0.0
+        
+        # 1. Check red flags (uma passada para todos os padrões)
+        found = {hit.flag for hit in doc.flag_hits}
+        flags.extend(flag for flag in self.red_flags if flag in found)
         
         # 2. Age appropriateness
-        age_level = self._get_age_level(context.age)
-        complexity = self._assess_complexity(content)
+        policy = self.get_policy(context)
+        age_level = policy.age_level
+        complexity = self._assess_complexity(doc)
         
-        if complexity > self.age_appropriate[age_level]["max_complexity"]:
+        if complexity > policy.max_complexity:
             flags.append("age_inappropriate")
-            adjusted = self._simplify_content(content, age_level)
+            adjusted = self._simplify_content(doc, age_level)
+        
+        if metrics is not None:
+            started = metrics.lap("complexity", started)
         
         # 3. Emotional appropriateness
-        emotional_depth = self._assess_emotional_depth(content)
-        if emotional_depth > self.age_appropriate[age_level]["emotional_depth"]:
+        emotional_depth = self._assess_emotional_depth(doc)
+        emotional = emotional_depth > policy.emotional_depth
+        if emotional:
             flags.append("emotionally_inappropriate")
-            adjusted = self._adjust_emotional_tone(content, age_level)
         
-        # 4. Special needs considerations
-        if context.special_needs:
-            adjusted = self._adapt_for_special_needs(adjusted, context.special_needs)
+        if metrics is not None:
+            started = metrics.lap("emotional_depth", started)
+        
+        # 4. Tom emocional + special needs em uma única reescrita
+        if emotional:
+            adjusted = policy.adapt(content, emotional=True, sentences=doc.sentences)
+        elif policy.special_needs:
+            sentences = doc.sentences if adjusted == content else None
+            adjusted = policy.adapt(adjusted, sentences=sentences)
+        
+        if metrics is not None:
+            metrics.lap("special_needs", started)
         
         # Resultado final
         safe = len(flags) == 0
@@ -81,6 +1470,7 @@ class ClaudeEthicalOverride:
         return {
             "safe": safe,
             "flags": flags,
+            "flag_hits": [asdict(hit) for hit in doc.flag_hits],
             "adjusted_content": adjusted,
             "original_content": content,
             "age_appropriate_level": age_level,
@@ -89,32 +1479,22 @@ class ClaudeEthicalOverride:
     
     def _contains_flag(self, content: str, flag: str) -> bool:
         """Detecta conteúdo problemático"""
-        flag_patterns = {
-            "self_harm": ["kill myself", "hurt myself", "want to die"],
-            "harm_to_others": ["hurt you", "kill them", "attack someone"],
-            "exploitation": ["send nudes", "meet alone", "keep secret"],
-            # ... outros patterns
-        }
-        
-        if flag in flag_patterns:
-            for pattern in flag_patterns[flag]:
-                if pattern in content.lower():
-                    return True
-        return False
+        return any(hit.flag == flag for hit in self.flag_matcher.scan(content))
     
     def _get_age_level(self, age: int) -> int:
         """Determina nível de idade apropriado"""
-        for threshold in sorted(self.age_appropriate.keys()):
-            if age <= threshold:
-                return threshold
+        if age < len(self._age_table):
+            return self._age_table[max(age, 0)]
         return 18
     
-    def _assess_complexity(self, content: str) -> int:
+    def _assess_complexity(self, doc: AnalyzedContent) -> int:
         """Avalia complexidade do conteúdo (1-6)"""
         # Lógica simplificada
-        sentences = content.split('.')
-        avg_length = sum(len(s.split()) for s in sentences) / max(len(sentences), 1)
-        
+        counts = doc.sentence_word_counts
+        return self._complexity_level(sum(counts) / max(len(counts), 1))
+    
+    def _complexity_level(self, avg_length: float) -> int:
+        """Converte média de palavras por sentença em nível (1-6)"""
         if avg_length < 8: return 1
         elif avg_length < 12: return 2
         elif avg_length < 16: return 3
@@ -122,67 +1502,44 @@ class ClaudeEthicalOverride:
         elif avg_length < 25: return 5
         else: return 6
     
-    def _simplify_content(self, content: str, age_level: int) -> str:
+    def _simplify_content(self, doc: AnalyzedContent, age_level: int) -> str:
         """Simplifica conteúdo para nível de idade apropriado"""
         # Implementação básica
         max_words = age_level * 10  # 3 anos = 30 palavras, 12 anos = 120 palavras
         
-        words = content.split()
+        words = doc.words
         if len(words) > max_words:
             simplified = ' '.join(words[:max_words]) + '...'
             return simplified
-        return content
+        return doc.content
     
-    def _assess_emotional_depth(self, content: str) -> int:
+    def _assess_emotional_depth(self, doc: AnalyzedContent) -> int:
         """Avalia profundidade emocional (1-6)"""
-        emotional_words = ["love", "hate", "fear", "angry", "sad", "happy", 
-                          "death", "loss", "trauma", "abuse", "violence"]
-        
-        count = sum(1 for word in emotional_words if word in content.lower())
-        
+        return self._emotional_depth_level(len(self._emotional_words_in(doc)))
+    
+    def _emotional_words_in(self, doc: AnalyzedContent) -> List[str]:
+        """Palavras emocionais distintas presentes no conteúdo"""
+        if self.emotional_matcher is not None:
+            return list(dict.fromkeys(hit.pattern for hit in self.emotional_matcher.scan(doc.lowered)))
+        return [word for word in EMOTIONAL_WORDS if word in doc.lowered]
+    
+    def _emotional_depth_level(self, count: int) -> int:
+        """Converte número de palavras emocionais distintas em nível (1-6)"""
         if count == 0: return 1
         elif count <= 2: return 2
         elif count <= 4: return 3
         elif count <= 6: return 4
         elif count <= 8: return 5
         else: return 6
-    
-    def _adjust_emotional_tone(self, content: str, age_level: int) -> str:
-        """Ajusta tom emocional para nível de idade"""
-        # Implementação básica
-        heavy_emotional = ["trauma", "abuse", "violence", "death", "suicide"]
-        
-        adjusted = content
-        for word in heavy_emotional:
-            if age_level < 12 and word in content.lower():
-                adjusted = adjusted.replace(word, "difficult situation")
-        
-        return adjusted
-    
-    def _adapt_for_special_needs(self, content: str, needs: List[str]) -> str:
-        """Adapta conteúdo para necessidades especiais"""
-        adapted = content
-        
-        if "autism" in needs:
-            # Clareza e estrutura
-            adapted = adapted.replace("maybe", "yes or no")
-            adapted = adapted.replace("perhaps", "")
-        
-        if "adhd" in needs:
-            # Brevidade e foco
-            sentences = adapted.split('.')
-            if len(sentences) > 3:
-                adapted = '. '.join(sentences[:3])
-        
-        if "dyslexia" in needs:
-            # Simplificação
-            adapted = adapted.replace("however", "but")
-            adapted = adapted.replace("therefore", "so")
-        
-        return adapted
 
 # Teste rápido
 if __name__ == "__main__":
+    # Etapa de build: python claude_ethics.py compile-lexicon fonte.json saida.nxlex
+    if len(sys.argv) == 4 and sys.argv[1] == "compile-lexicon":
+        compile_lexicon_file(sys.argv[2], sys.argv[3])
+        print(f"✅ Léxico compilado em {sys.argv[3]}")
+        sys.exit(0)
+    
     ethics = ClaudeEthicalOverride()
     
     test_context = ChildContext(
@@ -4,13 +4,531 @@
 Vetor 1: Verdade radical e questionamento
 """
 
+import asyncio
+import json
 import re
-from typing import List, Dict, Tuple
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Any, List, Dict, Iterable, Iterator, Optional, Tuple
+from dataclasses import dataclass, field
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+@dataclass
+class StatementScan:
+    """Resultado da varredura única de uma afirmação"""
+    question_types: List[str] = field(default_factory=list)
+    assumptions: List[str] = field(default_factory=list)
+    biases: List[str] = field(default_factory=list)
+    
+    @property
+    def question_type(self) -> str:
+        return self.question_types[0] if self.question_types else "question_general"
+
+def _references_groups(node) -> bool:
+    """Percorre a árvore do sre_parse procurando referências a grupos (\\1, (?P=nome), (?(1)...))"""
+    if isinstance(node, sre_parse.SubPattern):
+        return any(op in (sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS) or _references_groups(av)
+                   for op, av in node)
+    if isinstance(node, (list, tuple)):
+        return any(_references_groups(item) for item in node)
+    return False
+
+def _splices_into_scanner(pattern: str) -> bool:
+    """
+    Indica se o padrão pode ser embutido na regex combinada do scanner
+    Grupos nomeados colidem entre as cópias do padrão, referências
+    numeradas apontariam para outros grupos e flags globais só valem
+    no início da regex: esses padrões são varridos separadamente
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+        re.compile(f"(?:{pattern})")
+    except re.error:
+        return False
+    state = getattr(parsed, "state", None) or parsed.pattern
+    return not state.groupdict and not _references_groups(parsed)
+
+def placeholder_answer(question: str, level: int) -> str:
+    """Resposta padrão baseada no tipo de questão (placeholder para modelo)"""
+    if "por que" in question.lower():
+        return "Esta é uma crença baseada em observações e experiências anteriores."
+    elif "evidências" in question.lower():
+        return "As evidências incluem observações diretas, dados coletados e consenso especializado."
+    elif "exceção" in question.lower():
+        return "Sim, existem exceções que devemos considerar para uma compreensão mais precisa."
+    elif "origem" in question.lower():
+        return "Esta ideia vem de uma combinação de aprendizado, experiência e reflexão."
+    else:
+        return "Precisamos investigar isso mais a fundo para uma resposta completa."
+
+class AnswerBackendError(Exception):
+    """Falha ao obter resposta do backend de modelo"""
+
+class AnswerBackend(ABC):
+    """Interface assíncrona para gerar as respostas de cada nível"""
+    
+    @abstractmethod
+    async def generate(self, question: str, level: int) -> str:
+        """Resposta para a questão de um nível do loop"""
+    
+    async def close(self):
+        pass
+
+class PlaceholderAnswerBackend(AnswerBackend):
+    """Respostas padrão locais, sem modelo"""
+    
+    async def generate(self, question: str, level: int) -> str:
+        return placeholder_answer(question, level)
+
+class HTTPAnswerBackend(AnswerBackend):
+    """
+    Cliente para servidor de modelo local (HTTP/1.1 com keep-alive)
+    
+    Pedidos concorrentes (de várias afirmações, em níveis diferentes)
+    são agrupados em lotes: POST {"items": [{"question", "level"}]}
+    -> {"answers": [...]}. Conexões são reutilizadas de um pool limitado
+    e cada pedido tem seu próprio timeout.
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, path: str = "/answers",
+                 max_connections: int = 4, max_batch_size: int = 32,
+                 batch_window: float = 0.005, timeout: float = 10.0):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.max_connections = max_connections
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.timeout = timeout
+        
+        self._queue: List[Tuple[str, int, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._connection_slots: Optional[asyncio.Semaphore] = None
+        self._inflight = set()
+        
+        self.batches_sent = 0
+        self.connections_opened = 0
+    
+    async def generate(self, question: str, level: int) -> str:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((question, level, future))
+        
+        if len(self._queue) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            raise AnswerBackendError(f"Timeout de {self.timeout}s aguardando resposta") from None
+    
+    def _flush(self):
+        """Envia os pedidos acumulados como um lote"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        # Pedidos já expirados/cancelados não são enviados
+        items = [item for item in self._queue if not item[2].done()]
+        self._queue = []
+        
+        for start in range(0, len(items), self.max_batch_size):
+            task = asyncio.ensure_future(self._send_batch(items[start:start + self.max_batch_size]))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _send_batch(self, items: List[Tuple[str, int, asyncio.Future]]):
+        payload = {"items": [{"question": q, "level": level} for q, level, _ in items]}
+        try:
+            try:
+                response = await self._post(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+                answers = response["answers"]
+                if len(answers) != len(items):
+                    raise AnswerBackendError(f"Esperadas {len(items)} respostas, recebidas {len(answers)}")
+            except Exception as exc:
+                error = exc if isinstance(exc, AnswerBackendError) else AnswerBackendError(str(exc))
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(error)
+                return
+            
+            self.batches_sent += 1
+            for (_, _, future), answer in zip(items, answers):
+                if not future.done():
+                    future.set_result(answer)
+        finally:
+            # Lote cancelado por close(): os chamadores não ficam esperando o timeout
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(AnswerBackendError("backend fechado"))
+    
+    async def _acquire(self, reuse: bool = True) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        """Ocupa um slot do pool; retorna (reader, writer, conexão reutilizada)"""
+        if self._connection_slots is None:
+            self._connection_slots = asyncio.Semaphore(self.max_connections)
+        await self._connection_slots.acquire()
+        
+        while reuse and self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port),
+                                                    self.timeout)
+        except BaseException:
+            self._connection_slots.release()
+            raise
+        self.connections_opened += 1
+        return reader, writer, False
+    
+    def _release(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, reusable: bool):
+        if reusable:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        self._connection_slots.release()
+    
+    async def _post(self, body: bytes) -> Dict:
+        reader, writer, reused = await self._acquire()
+        try:
+            return await self._exchange(reader, writer, body)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            if not reused:
+                raise
+        
+        # Conexão ociosa derrubada pelo servidor (ex.: reinício): uma nova tentativa
+        reader, writer, _ = await self._acquire(reuse=False)
+        return await self._exchange(reader, writer, body)
+    
+    async def _exchange(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                        body: bytes) -> Dict:
+        """Uma troca pedido/resposta com prazo; a conexão só volta ao pool se íntegra"""
+        reusable = False
+        try:
+            response, reusable = await asyncio.wait_for(self._roundtrip(reader, writer, body),
+                                                        self.timeout)
+            return response
+        except asyncio.TimeoutError:
+            raise AnswerBackendError(f"Timeout de {self.timeout}s na troca HTTP") from None
+        finally:
+            # Em erro, timeout ou cancelamento a conexão é descartada e o slot liberado
+            self._release(reader, writer, reusable)
+    
+    async def _roundtrip(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                         body: bytes) -> Tuple[Dict, bool]:
+        writer.write(
+            f"POST {self.path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n".encode("ascii") + body
+        )
+        await writer.drain()
+        
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Conexão encerrada pelo servidor")
+        parts = status_line.decode("latin-1").split(" ", 2)
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise AnswerBackendError(f"Resposta HTTP inválida: {status_line!r}")
+        
+        headers = await _read_headers(reader)
+        response_body = await reader.readexactly(int(headers.get("content-length", "0")))
+        
+        if parts[1] != "200":
+            raise AnswerBackendError(f"Servidor respondeu {parts[1]}: {response_body[:200]!r}")
+        return json.loads(response_body), headers.get("connection", "").lower() != "close"
+    
+    async def close(self):
+        """Fecha conexões ociosas e descarta pedidos pendentes"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for _, _, future in self._queue:
+            future.cancel()
+        self._queue = []
+        
+        for task in list(self._inflight):
+            task.cancel()
+        for _, writer in self._idle:
+            writer.close()
+        self._idle = []
+
+async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    """Lê cabeçalhos HTTP até a linha em branco"""
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+class StubAnswerServer:
+    """
+    Servidor local que imita o servidor de modelo (para testes e desenvolvimento)
+    Responde com placeholder_answer, opcionalmente com atraso por lote
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0):
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers = set()
+        
+        self.connections = 0
+        self.batches = 0
+        self.items = 0
+    
+    async def start(self) -> int:
+        """Inicia o servidor e retorna a porta efetiva"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+    
+    async def close(self):
+        """Para de aceitar conexões e encerra as abertas (o cliente vê EOF)"""
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                
+                headers = await _read_headers(reader)
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                
+                try:
+                    items = json.loads(body)["items"]
+                    if self.delay:
+                        await asyncio.sleep(self.delay)
+                    answers = [placeholder_answer(item["question"], item["level"]) for item in items]
+                    status, payload = "200 OK", {"answers": answers}
+                    self.batches += 1
+                    self.items += len(items)
+                except (ValueError, KeyError, TypeError) as exc:
+                    status, payload = "400 Bad Request", {"error": str(exc)}
+                
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    "Connection: keep-alive\r\n\r\n".encode("ascii") + data
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            # Encerramento do servidor/loop com a conexão ainda aberta
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+# Vocabulário para a análise de consistência entre sentenças
+QUANTIFIER_FORMS = {
+    "sempre": "sempre", "nunca": "nunca",
+    "todos": "todos", "todas": "todos",
+    "alguns": "alguns", "algumas": "alguns",
+    "nenhum": "nenhum", "nenhuma": "nenhum"
+}
+CONTRADICTORY_QUANTIFIERS = {
+    "sempre": {"nunca"}, "nunca": {"sempre"},
+    "todos": {"alguns", "nenhum"}, "alguns": {"todos"}, "nenhum": {"todos"}
+}
+NEGATIVE_WORDS = frozenset(["não", "nunca", "nenhum", "nenhuma", "jamais"])
+SUBJECT_STOPWORDS = frozenset([
+    "o", "a", "os", "as", "um", "uma", "uns", "umas", "de", "do", "da", "dos", "das",
+    "e", "ou", "que", "em", "no", "na", "nos", "nas", "é", "são", "eu", "você", "ele",
+    "ela", "eles", "elas", "isso", "isto", "esse", "essa", "este", "esta", "muito",
+    "mais", "também", "já", "se", "por", "para", "com"
+])
+
+class StreamingConsistencyAnalyzer:
+    """
+    Análise de documento em streaming com consistência entre sentenças
+    
+    Segmenta sentenças conforme o texto chega e mantém um índice
+    sujeito -> quantificadores e afirmações (predicado, polaridade).
+    O predicado inclui o verbo e as demais palavras de conteúdo, então
+    "gatos bebem leite" e "gatos não bebem água" não se contradizem.
+    Cada sentença nova é comparada apenas com as entradas do seu sujeito,
+    sem comparar todos os pares de sentenças.
+    """
+    
+    _SENTENCE_END = re.compile(r"[.!?]+(?=\s)")
+    _WORD = re.compile(r"\w+")
+    
+    def __init__(self, engine: "GrokTruthEngine"):
+        self.engine = engine
+        self.sentence_count = 0
+        self.contradictions: List[Dict] = []
+        self._buffer = ""
+        self._offset = 0
+        # sujeito -> {"quantifiers": {(predicado, q): ref}, "claims": {(predicado, positivo): ref}}
+        self._index: Dict[str, Dict[str, Dict]] = {}
+    
+    def feed(self, chunk: str) -> List[Dict]:
+        """Processa um trecho e retorna a análise das sentenças completas"""
+        # O buffer restante não tem terminador seguido de espaço: a busca
+        # recomeça no último terminador pendente, não no início do buffer
+        scan_from = len(self._buffer.rstrip(".!?"))
+        self._buffer += chunk
+        
+        # Só corta em terminador seguido de espaço (o próximo trecho pode continuar "3.5")
+        results = []
+        start = 0
+        for match in self._SENTENCE_END.finditer(self._buffer, scan_from):
+            sentence = self._buffer[start:match.end()]
+            if sentence.strip():
+                results.append(self._analyze_sentence(sentence.strip(), self._offset + start))
+            start = match.end()
+        
+        self._buffer = self._buffer[start:]
+        self._offset += start
+        return results
+    
+    def finish(self) -> List[Dict]:
+        """Processa o texto restante no buffer como última sentença"""
+        results = []
+        if self._buffer.strip():
+            results.append(self._analyze_sentence(self._buffer.strip(), self._offset))
+        self._offset += len(self._buffer)
+        self._buffer = ""
+        return results
+    
+    def summary(self) -> Dict:
+        return {
+            "sentence_count": self.sentence_count,
+            "subjects_tracked": len(self._index),
+            "contradictions": list(self.contradictions),
+            "is_consistent": len(self.contradictions) == 0
+        }
+    
+    @staticmethod
+    def _singular(word: str) -> str:
+        """Normalização simples de plural (ex: gatos -> gato, cães -> cão)"""
+        if word.endswith(("ães", "ões")):
+            return word[:-3] + "ão"
+        if len(word) > 3 and word.endswith("s"):
+            return word[:-1]
+        return word
+    
+    def _extract_claim(self, words: List[str]) -> Tuple[Optional[str], Optional[str], List[str], bool]:
+        """Sujeito, predicado (verbo + complemento), quantificadores e polaridade"""
+        subject = None
+        content = []
+        quantifiers = []
+        
+        for word in words:
+            quantifier = QUANTIFIER_FORMS.get(word)
+            if quantifier is not None:
+                quantifiers.append(quantifier)
+                continue
+            if word in NEGATIVE_WORDS or word in SUBJECT_STOPWORDS:
+                continue
+            if subject is None:
+                if not word.isdigit():
+                    subject = self._singular(word)
+            else:
+                content.append(self._singular(word))
+        
+        predicate = " ".join(content) or None
+        positive = not any(word in NEGATIVE_WORDS for word in words)
+        return subject, predicate, quantifiers, positive
+    
+    def _analyze_sentence(self, sentence: str, offset: int) -> Dict:
+        index = self.sentence_count
+        self.sentence_count += 1
+        
+        words = self._WORD.findall(sentence.lower())
+        subject, predicate, quantifiers, positive = self._extract_claim(words)
+        scan = self.engine.scan_statement(sentence)
+        ref = {"sentence_index": index, "sentence": sentence}
+        
+        # Um relato por par de sentenças, mesmo com mais de um motivo
+        found: Dict[int, Dict] = {}
+        if subject is not None:
+            entry = self._index.setdefault(subject, {"quantifiers": {}, "claims": {}})
+            
+            for quantifier in quantifiers:
+                for opposite in CONTRADICTORY_QUANTIFIERS.get(quantifier, ()):
+                    earlier = entry["quantifiers"].get((predicate, opposite))
+                    if earlier is not None:
+                        found.setdefault(earlier["sentence_index"], {
+                            **earlier,
+                            "reason": f"Uso de '{opposite}' e '{quantifier}' sobre '{subject}'"
+                        })
+                entry["quantifiers"].setdefault((predicate, quantifier), ref)
+            
+            if predicate is not None:
+                earlier = entry["claims"].get((predicate, not positive))
+                if earlier is not None:
+                    found.setdefault(earlier["sentence_index"], {
+                        **earlier,
+                        "reason": f"Afirmação e negação de '{subject} {predicate}'"
+                    })
+                entry["claims"].setdefault((predicate, positive), ref)
+        
+        contradictions = [found[earlier] for earlier in sorted(found)]
+        for contradiction in contradictions:
+            self.contradictions.append({**contradiction, "contradicted_by": index})
+        
+        return {
+            "sentence_index": index,
+            "sentence": sentence,
+            "offset": offset,
+            "subject": subject,
+            "predicate": predicate,
+            "quantifiers": quantifiers,
+            "polarity": "positive" if positive else "negative",
+            "assumptions": scan.assumptions,
+            "potential_biases": scan.biases,
+            "internal_consistency": self.engine._check_internal_consistency(sentence),
+            "contradictions": contradictions
+        }
+
+# Engine por processo usada por analyze_statements(workers > 1)
+_worker_engine: Optional["GrokTruthEngine"] = None
+
+def _init_worker(engine_class: type, init_kwargs: Dict[str, Any]):
+    """Compila a engine (mesma classe e padrões do chamador) uma única vez por processo"""
+    global _worker_engine
+    _worker_engine = engine_class(**init_kwargs)
+
+def _analyze_chunk(statements: List[str], include_whys: bool) -> List[Dict]:
+    """Analisa um bloco de afirmações dentro do worker"""
+    return [_worker_engine.analyze_statement(s, include_whys) for s in statements]
 
 class GrokTruthEngine:
     """Engine de questionamento radical estilo Grok"""
     
-    def __init__(self):
+    def __init__(self, question_patterns: Optional[List[Tuple[str, str]]] = None,
+                 assumption_patterns: Optional[List[Tuple[str, str]]] = None,
+                 bias_patterns: Optional[List[Tuple[str, str]]] = None):
         self.question_patterns = [
             (r"por que", "question_cause"),
             (r"como funciona", "question_mechanism"),
@@ -22,6 +540,87 @@ class GrokTruthEngine:
             (r"qual a fonte", "question_source"),
             (r"existe alternativa", "question_alternatives")
         ]
+        
+        # Padrões comuns de suposição
+        self.assumption_patterns = [
+            (r"todo(s|as)?\s+\w+", "generalização universal"),
+            (r"sempre|nunca", "generalização temporal"),
+            (r"obviamente|claramente", "pressuposto de clareza"),
+            (r"todo mundo sabe", "pressuposto de conhecimento comum"),
+            (r"naturalmente", "pressuposto de naturalidade")
+        ]
+        
+        self.bias_patterns = [
+            (r"melhor\s+\w+", "viés de superioridade"),
+            (r"pior\s+\w+", "viés de inferioridade"),
+            (r"só\s+\w+", "viés de exclusividade"),
+            (r"nunca\s+\w+", "viés de absolutismo"),
+            (r"todo\s+\w+", "viés de generalização")
+        ]
+        
+        # Padrões (regex, rótulo) customizados substituem os padrões acima
+        if question_patterns is not None:
+            self.question_patterns = list(question_patterns)
+        if assumption_patterns is not None:
+            self.assumption_patterns = list(assumption_patterns)
+        if bias_patterns is not None:
+            self.bias_patterns = list(bias_patterns)
+        
+        self._compile_scanner()
+        
+        # Níveis >= 2 dependem só da resposta anterior (cauda memoizada)
+        self._cached_why_level = lru_cache(maxsize=256)(self._build_why_level)
+        self._cached_answer = lru_cache(maxsize=256)(self._next_answer)
+    
+    def _compile_scanner(self):
+        """
+        Compila todos os padrões em uma única regex
+        Cada padrão vira um lookahead opcional com grupo nomeado, de modo
+        que padrões sobrepostos na mesma posição são todos detectados
+        Padrões que não podem ser embutidos ficam com regex própria
+        """
+        self._scan_groups: Dict[str, Tuple[str, int, str]] = {}
+        self._own_scanners: List[Tuple[str, "re.Pattern"]] = []
+        alternatives = []
+        lookaheads = []
+        
+        for kind, patterns in (("question", self.question_patterns),
+                               ("assumption", self.assumption_patterns),
+                               ("bias", self.bias_patterns)):
+            for index, (pattern, label) in enumerate(patterns):
+                name = f"{kind}_{index}"
+                self._scan_groups[name] = (kind, index, label)
+                if not _splices_into_scanner(pattern):
+                    self._own_scanners.append((name, re.compile(pattern, re.IGNORECASE)))
+                    continue
+                alternatives.append(f"(?:{pattern})")
+                lookaheads.append(f"(?:(?=(?P<{name}>{pattern})))?")
+        
+        # O primeiro lookahead limita as paradas às posições onde algum padrão começa
+        self._scanner = None
+        if alternatives:
+            self._scanner = re.compile(
+                f"(?=(?:{'|'.join(alternatives)})){''.join(lookaheads)}", re.IGNORECASE
+            )
+    
+    def scan_statement(self, statement: str) -> StatementScan:
+        """Detecta tipos de questão, suposições e viéses em uma única varredura"""
+        found = set()
+        if self._scanner is not None:
+            for match in self._scanner.finditer(statement):
+                found.update(name for name, value in match.groupdict().items() if value is not None)
+        found.update(name for name, regex in self._own_scanners if regex.search(statement))
+        
+        # Manter a ordem de declaração dos padrões
+        scan = StatementScan()
+        by_kind = {"question": scan.question_types,
+                   "assumption": scan.assumptions,
+                   "bias": scan.biases}
+        for name, (kind, _, label) in self._scan_groups.items():
+            if name in found:
+                by_kind[kind].append(label)
+        
+        return scan
     
     def seven_whys_loop(self, statement: str, depth: int = 7) -> List[Dict]:
         """
@@ -34,29 +633,71 @@ class GrokTruthEngine:
         Returns:
             Lista de questões e respostas em cada nível
         """
-        loop_results = []
+        return list(self.iter_whys(statement, depth))
+    
+    def iter_whys(self, statement: str, depth: int = 7) -> Iterator[Dict]:
+        """
+        Versão preguiçosa do loop dos 7 porquês: cada nível é calculado
+        apenas quando consumido
+        
+        Args:
+            statement: Afirmação inicial
+            depth: Profundidade máxima do questionamento
+        """
         current_statement = statement
         
         for level in range(1, depth + 1):
-            # Gerar questão para este nível
-            question = self._generate_question(current_statement, level)
+            if level == 1:
+                # Primeiro nível depende da afirmação: não cachear
+                entry = self._build_why_level(current_statement, level)
+            else:
+                entry = self._cached_why_level(current_statement, level)
             
-            # Tentar responder (no futuro, com modelo)
-            potential_answer = self._generate_potential_answer(question, level)
-            
-            # Registrar
-            loop_results.append({
-                "level": level,
-                "question": question,
-                "current_belief": current_statement,
-                "potential_answer": potential_answer,
-                "question_type": self._classify_question(question)
-            })
+            yield dict(entry)
             
             # Atualizar statement para próximo nível
-            current_statement = potential_answer
+            current_statement = entry["potential_answer"]
+    
+    def iter_answers(self, statement: str, depth: int = 7) -> Iterator[str]:
+        """
+        Apenas as respostas do loop dos porquês, nível a nível, sem montar
+        (nem classificar) as questões de cada nível
+        """
+        current_statement = statement
+        for level in range(1, depth + 1):
+            if level == 1:
+                current_statement = self._next_answer(current_statement, level)
+            else:
+                current_statement = self._cached_answer(current_statement, level)
+            yield current_statement
+    
+    def _next_answer(self, current_statement: str, level: int) -> str:
+        """Resposta de um nível a partir da crença atual"""
+        question = self._generate_question(current_statement, level)
+        return self._generate_potential_answer(question, level)
+    
+    def _build_why_level(self, current_statement: str, level: int,
+                         question: Optional[str] = None,
+                         potential_answer: Optional[str] = None) -> Dict:
+        """
+        Calcula um nível do loop a partir da crença atual
+        (questão e resposta podem vir prontas, ex.: de um backend assíncrono)
+        """
+        # Gerar questão para este nível
+        if question is None:
+            question = self._generate_question(current_statement, level)
         
-        return loop_results
+        # Tentar responder (no futuro, com modelo)
+        if potential_answer is None:
+            potential_answer = self._generate_potential_answer(question, level)
+        
+        return {
+            "level": level,
+            "question": question,
+            "current_belief": current_statement,
+            "potential_answer": potential_answer,
+            "question_type": self._classify_question(question)
+        }
     
     def _generate_question(self, statement: str, level: int) -> str:
         """Gera questão apropriada para o nível"""
@@ -76,69 +717,186 @@ class GrokTruthEngine:
     
     def _generate_potential_answer(self, question: str, level: int) -> str:
         """Gera resposta potencial (placeholder para modelo)"""
-        
-        # Respostas padrão baseadas no tipo de questão
-        if "por que" in question.lower():
-            return "Esta é uma crença baseada em observações e experiências anteriores."
-        elif "evidências" in question.lower():
-            return "As evidências incluem observações diretas, dados coletados e consenso especializado."
-        elif "exceção" in question.lower():
-            return "Sim, existem exceções que devemos considerar para uma compreensão mais precisa."
-        elif "origem" in question.lower():
-            return "Esta ideia vem de uma combinação de aprendizado, experiência e reflexão."
-        else:
-            return "Precisamos investigar isso mais a fundo para uma resposta completa."
+        return placeholder_answer(question, level)
     
     def _classify_question(self, question: str) -> str:
         """Classifica o tipo de questão"""
-        for pattern, q_type in self.question_patterns:
-            if re.search(pattern, question, re.IGNORECASE):
-                return q_type
-        return "question_general"
+        return self.scan_statement(question).question_type
     
-    def analyze_statement(self, statement: str) -> Dict:
-        """Análise completa de uma afirmação"""
+    def analyze_statement(self, statement: str, include_whys: bool = True) -> Dict:
+        """
+        Análise completa de uma afirmação
         
-        # 1. Loop dos 7 porquês
-        why_loop = self.seven_whys_loop(statement)
+        Args:
+            statement: Afirmação a analisar
+            include_whys: Incluir o loop completo em "seven_whys_analysis";
+                          False gera apenas o resumo (score e recomendação)
+        """
         
-        # 2. Identificar suposições
-        assumptions = self._extract_assumptions(statement)
+        # 1. Loop dos 7 porquês (no resumo, só as respostas)
+        if not include_whys:
+            return self._assemble_analysis(statement, list(self.iter_answers(statement)))
+        
+        why_loop = self.seven_whys_loop(statement)
+        return self._assemble_analysis(statement, [level["potential_answer"] for level in why_loop],
+                                       why_loop)
+    
+    def _assemble_analysis(self, statement: str, answers: List[str],
+                           why_loop: Optional[List[Dict]] = None) -> Dict:
+        """
+        Completa a análise a partir das respostas do loop já calculadas
+        (why_loop entra em "seven_whys_analysis" quando fornecido)
+        """
+        # 2. Suposições, viéses e tipos de questão em uma única varredura
+        scan = self.scan_statement(statement)
+        assumptions = scan.assumptions
+        biases = scan.biases
         
         # 3. Verificar consistência interna
         consistency = self._check_internal_consistency(statement)
         
-        # 4. Identificar viéses potenciais
-        biases = self._identify_potential_biases(statement)
-        
-        return {
-            "original_statement": statement,
-            "seven_whys_analysis": why_loop,
+        analysis = {"original_statement": statement}
+        if why_loop is not None:
+            analysis["seven_whys_analysis"] = why_loop
+        analysis.update({
+            "question_types": scan.question_types,
             "assumptions": assumptions,
             "internal_consistency": consistency,
             "potential_biases": biases,
-            "truth_score": self._calculate_truth_score(why_loop, consistency),
-            "recommendation": self._generate_recommendation(why_loop, biases)
-        }
+            "truth_score": self._calculate_truth_score(answers, consistency),
+            "recommendation": self._generate_recommendation(answers, biases)
+        })
+        return analysis
     
-    def _extract_assumptions(self, statement: str) -> List[str]:
-        """Extrai suposições implícitas"""
-        assumptions = []
+    def stream_analyzer(self) -> StreamingConsistencyAnalyzer:
+        """Cria analisador de documento em streaming"""
+        return StreamingConsistencyAnalyzer(self)
+    
+    def analyze_document(self, chunks: Iterable[str]) -> Dict:
+        """
+        Analisa um documento (texto ou sequência de trechos) sentença a sentença,
+        incluindo contradições entre sentenças
+        """
+        if isinstance(chunks, str):
+            chunks = [chunks]
         
-        # Padrões comuns de suposição
-        assumption_patterns = [
-            (r"todo(s|as)?\s+\w+", "generalização universal"),
-            (r"sempre|nunca", "generalização temporal"),
-            (r"obviamente|claramente", "pressuposto de clareza"),
-            (r"todo mundo sabe", "pressuposto de conhecimento comum"),
-            (r"naturalmente", "pressuposto de naturalidade")
-        ]
+        analyzer = self.stream_analyzer()
+        sentences = []
+        for chunk in chunks:
+            sentences.extend(analyzer.feed(chunk))
+        sentences.extend(analyzer.finish())
+        
+        return {"sentences": sentences, **analyzer.summary()}
+    
+    async def seven_whys_loop_async(self, statement: str, backend: AnswerBackend,
+                                    depth: int = 7) -> List[Dict]:
+        """
+        Loop dos porquês com respostas de um backend assíncrono
+        Cada nível depende da resposta anterior; o ganho vem de executar
+        várias afirmações ao mesmo tempo, cujos níveis são agrupados em
+        lotes pelo backend
+        """
+        loop_results = []
+        current_statement = statement
+        
+        for level in range(1, depth + 1):
+            question = self._generate_question(current_statement, level)
+            potential_answer = await backend.generate(question, level)
+            
+            loop_results.append(self._build_why_level(current_statement, level,
+                                                      question, potential_answer))
+            current_statement = potential_answer
+        
+        return loop_results
+    
+    async def analyze_statement_async(self, statement: str, backend: AnswerBackend,
+                                      include_whys: bool = True) -> Dict:
+        """analyze_statement com respostas de um backend assíncrono"""
+        if not include_whys:
+            answers = await self._answers_async(statement, backend)
+            return self._assemble_analysis(statement, answers)
+        
+        why_loop = await self.seven_whys_loop_async(statement, backend)
+        return self._assemble_analysis(statement, [level["potential_answer"] for level in why_loop],
+                                       why_loop)
+    
+    async def _answers_async(self, statement: str, backend: AnswerBackend,
+                             depth: int = 7) -> List[str]:
+        """Apenas as respostas do loop assíncrono (modo resumo)"""
+        answers = []
+        current_statement = statement
+        for level in range(1, depth + 1):
+            question = self._generate_question(current_statement, level)
+            current_statement = await backend.generate(question, level)
+            answers.append(current_statement)
+        return answers
+    
+    async def analyze_statements_async(self, statements: Iterable[str], backend: AnswerBackend,
+                                       concurrency: int = 32,
+                                       summary_only: bool = False) -> List[Dict]:
+        """
+        Analisa várias afirmações concorrentemente (no máximo concurrency
+        ao mesmo tempo), retornando na ordem da entrada
+        """
+        slots = asyncio.Semaphore(concurrency)
+        
+        async def analyze(statement: str) -> Dict:
+            async with slots:
+                return await self.analyze_statement_async(statement, backend, not summary_only)
+        
+        return await asyncio.gather(*(analyze(statement) for statement in statements))
+    
+    def analyze_statements(self, statements: Iterable[str], workers: int = 1,
+                           chunk_size: int = 64, summary_only: bool = False) -> Iterator[Dict]:
+        """
+        Analisa um corpus de afirmações, em ordem, sob demanda
+        
+        Args:
+            statements: Afirmações (qualquer iterável, inclusive streams)
+            workers: Processos a usar; 1 executa no processo atual
+            chunk_size: Afirmações por tarefa enviada ao pool
+            summary_only: Omitir "seven_whys_analysis" (menos memória e IPC)
+        
+        Returns:
+            Iterador de análises na mesma ordem da entrada
+        """
+        include_whys = not summary_only
         
-        for pattern, desc in assumption_patterns:
-            if re.search(pattern, statement, re.IGNORECASE):
-                assumptions.append(desc)
+        if workers <= 1:
+            for statement in statements:
+                yield self.analyze_statement(statement, include_whys)
+            return
         
-        return assumptions
+        iterator = iter(statements)
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(type(self), self._worker_init_kwargs()))
+        pending = deque()
+        try:
+            # Janela limitada de blocos em voo: memória constante para streams longos
+            while True:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                pending.append(pool.submit(_analyze_chunk, chunk, include_whys))
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+    
+    def _worker_init_kwargs(self) -> Dict[str, Any]:
+        """Argumentos para recriar esta engine em um processo worker"""
+        return {
+            "question_patterns": self.question_patterns,
+            "assumption_patterns": self.assumption_patterns,
+            "bias_patterns": self.bias_patterns
+        }
+    
+    def _extract_assumptions(self, statement: str) -> List[str]:
+        """Extrai suposições implícitas"""
+        return self.scan_statement(statement).assumptions
     
     def _check_internal_consistency(self, statement: str) -> Dict:
         """Verifica consistência interna"""
@@ -163,23 +921,9 @@ class GrokTruthEngine:
     
     def _identify_potential_biases(self, statement: str) -> List[str]:
         """Identifica viéses potenciais"""
-        biases = []
-        
-        bias_patterns = [
-            (r"melhor\s+\w+", "viés de superioridade"),
-            (r"pior\s+\w+", "viés de inferioridade"),
-            (r"só\s+\w+", "viés de exclusividade"),
-            (r"nunca\s+\w+", "viés de absolutismo"),
-            (r"todo\s+\w+", "viés de generalização")
-        ]
-        
-        for pattern, bias_type in bias_patterns:
-            if re.search(pattern, statement, re.IGNORECASE):
-                biases.append(bias_type)
-        
-        return biases
+        return self.scan_statement(statement).biases
     
-    def _calculate_truth_score(self, why_loop: List, consistency: Dict) -> float:
+    def _calculate_truth_score(self, answers: List[str], consistency: Dict) -> float:
         """Calcula score de verdade (0-1)"""
         # Lógica simplificada
         base_score = 0.5
@@ -189,19 +933,19 @@ class GrokTruthEngine:
             base_score += 0.2
         
         # Penalidade por muitas questões não respondidas
-        unanswered = sum(1 for level in why_loop if "investigar" in level["potential_answer"].lower())
+        unanswered = sum(1 for answer in answers if "investigar" in answer.lower())
         if unanswered > 3:
             base_score -= 0.1 * (unanswered - 3)
         
         # Limitar entre 0 e 1
         return max(0.0, min(1.0, base_score))
     
-    def _generate_recommendation(self, why_loop: List, biases: List[str]) -> str:
+    def _generate_recommendation(self, answers: List[str], biases: List[str]) -> str:
         """Gera recomendação baseada na análise"""
         if len(biases) > 0:
             return f"Recomendo questionar os seguintes viéses: {', '.join(biases)}"
         
-        last_answer = why_loop[-1]["potential_answer"].lower()
+        last_answer = answers[-1].lower()
         if "investigar" in last_answer or "precisamos" in last_answer:
             return "Recomendo pesquisa adicional para validar esta afirmação."
         
@@ -209,6 +953,16 @@ class GrokTruthEngine:
 
 # Teste rápido
 if __name__ == "__main__":
+    import sys
+    
+    # Servidor stub local: python grok_engine.py serve-stub [porta]
+    if len(sys.argv) >= 2 and sys.argv[1] == "serve-stub":
+        async def serve():
+            server = StubAnswerServer(port=int(sys.argv[2]) if len(sys.argv) > 2 else 8765)
+            print(f"🦊 Stub de respostas em http://127.0.0.1:{await server.start()}/answers")
+            await asyncio.Event().wait()
+        asyncio.run(serve())
+    
     grok = GrokTruthEngine()
     
     test_statement = "Todos os gatos gostam de leite."
@@ -4,13 +4,292 @@
 Vetor 7: Factualidade ancorada e sistema de citações
 """
 
-import chromadb
-from chromadb.config import Settings
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Dict, Any, Optional
+import csv
 import json
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from itertools import islice
 from datetime import datetime
 import hashlib
 import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# chromadb é importado só quando o cliente é criado: o import é pesado
+if TYPE_CHECKING:
+    import chromadb
+
+class DeferredEmbeddingFunction:
+    """Função de embedding padrão do ChromaDB, carregada no primeiro uso"""
+    
+    # Fixo: identificar o modelo (cache em disco) não pode carregá-lo
+    model_id = "ONNXMiniLM_L6_V2:all-MiniLM-L6-v2"
+    
+    def __init__(self):
+        self._function = None
+        self._lock = threading.Lock()
+    
+    def resolve(self) -> Callable:
+        if self._function is None:
+            with self._lock:
+                if self._function is None:
+                    from chromadb.utils import embedding_functions
+                    self._function = embedding_functions.DefaultEmbeddingFunction()
+        return self._function
+    
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        return self.resolve()(input)
+
+def embedding_model_id(embedding_function: Callable) -> Optional[str]:
+    """
+    Identificador estável do modelo de uma função de embedding
+    Usa model_id explícito ou o nome do modelo da configuração; None se
+    não houver (o nome da classe não distingue modelos diferentes)
+    """
+    model_id = getattr(embedding_function, "model_id", None)
+    if model_id:
+        return str(model_id)
+    for attr in ("model_name", "_model_name", "MODEL_NAME", "_api_url"):
+        name = getattr(embedding_function, attr, None)
+        if isinstance(name, str) and name:
+            return f"{type(embedding_function).__name__}:{name}"
+    return None
+
+def normalize_embeddings(vectors: Iterable, expected: int) -> List[List[float]]:
+    """
+    Vetores da função de embedding como listas de float (o ChromaDB recusa
+    arrays numpy), um por texto
+    """
+    embeddings = [[float(x) for x in vector] for vector in vectors]
+    if len(embeddings) != expected:
+        raise ValueError(f"Função de embedding retornou {len(embeddings)} vetores "
+                         f"para {expected} textos")
+    return embeddings
+
+class EmbeddingCache:
+    """
+    Cache de embeddings por digest do texto
+    Nível em memória (LRU) e nível opcional em disco (SQLite)
+    
+    O nível em disco exige um model_id estável: ele entra no digest para que
+    modelos diferentes não compartilhem vetores
+    """
+    
+    def __init__(self, embedding_function: Callable[[List[str]], List[List[float]]],
+                 max_entries: int = 4096, disk_path: Optional[str] = None,
+                 model_id: Optional[str] = None):
+        if max_entries <= 0:
+            raise ValueError("max_entries deve ser positivo")
+        
+        self.embedding_function = embedding_function
+        self.max_entries = max_entries
+        self.model_id = model_id or embedding_model_id(embedding_function)
+        self._memory: "OrderedDict[bytes, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self._disk: Optional[sqlite3.Connection] = None
+        if disk_path:
+            if not self.model_id:
+                raise ValueError("Cache de embeddings em disco exige model_id: "
+                                 f"{type(embedding_function).__name__} não informa o modelo")
+            os.makedirs(os.path.dirname(disk_path) or ".", exist_ok=True)
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute("CREATE TABLE IF NOT EXISTS embeddings "
+                               "(digest BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+            self._disk.commit()
+        
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.embedded_texts = 0
+        self.embed_seconds = 0.0
+    
+    def _digest(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self.model_id or ''}\0{text}".encode("utf-8", "surrogatepass")).digest()
+    
+    def _remember(self, digest: bytes, vector: List[float]):
+        self._memory[digest] = vector
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings na ordem de texts, calculando só os digests inéditos"""
+        digests = [self._digest(text) for text in texts]
+        vectors: Dict[bytes, List[float]] = {}
+        pending: Dict[bytes, str] = {}
+        
+        with self._lock:
+            for digest, text in zip(digests, texts):
+                if digest in vectors or digest in pending:
+                    self.memory_hits += 1  # Repetido no mesmo lote
+                    continue
+                vector = self._memory.get(digest)
+                if vector is not None:
+                    self._memory.move_to_end(digest)
+                    vectors[digest] = vector
+                    self.memory_hits += 1
+                else:
+                    pending[digest] = text
+            
+            if pending and self._disk is not None:
+                for digest, vector in self._load_from_disk(list(pending)).items():
+                    del pending[digest]
+                    vectors[digest] = vector
+                    self._remember(digest, vector)
+                    self.disk_hits += 1
+        
+        if pending:
+            start = time.perf_counter()
+            computed = normalize_embeddings(self.embedding_function(list(pending.values())),
+                                            len(pending))
+            elapsed = time.perf_counter() - start
+            
+            with self._lock:
+                self.misses += len(pending)
+                self.embedded_texts += len(pending)
+                self.embed_seconds += elapsed
+                for digest, vector in zip(pending, computed):
+                    vectors[digest] = vector
+                    self._remember(digest, vector)
+                if self._disk is not None:
+                    self._store_on_disk(zip(pending, computed))
+        
+        return [vectors[digest] for digest in digests]
+    
+    def _load_from_disk(self, digests: List[bytes]) -> Dict[bytes, List[float]]:
+        found = {}
+        # Limite de parâmetros do SQLite: consulta em blocos
+        for i in range(0, len(digests), 500):
+            chunk = digests[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._disk.execute(
+                f"SELECT digest, vector FROM embeddings WHERE digest IN ({placeholders})", chunk
+            )
+            for digest, blob in rows:
+                found[bytes(digest)] = array("d", blob).tolist()
+        return found
+    
+    def _store_on_disk(self, items):
+        self._disk.executemany(
+            "INSERT OR REPLACE INTO embeddings (digest, vector) VALUES (?, ?)",
+            [(digest, array("d", vector).tobytes()) for digest, vector in items]
+        )
+        self._disk.commit()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Taxas de acerto e tempo de embedding economizado (estimado)"""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        avg_embed = self.embed_seconds / self.embedded_texts if self.embedded_texts else 0.0
+        return {
+            "entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "disk_tier": self._disk is not None,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "embed_seconds": self.embed_seconds,
+            "estimated_seconds_saved": hits * avg_embed
+        }
+    
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+# Tipos aceitos pelo ChromaDB como valor de metadado
+METADATA_SCALARS = (str, int, float, bool)
+
+def iter_jsonl_documents(path: str, text_field: str = "document") -> Iterator[Dict[str, Any]]:
+    """
+    Lê documentos de um arquivo JSONL sem carregá-lo inteiro
+    
+    Cada linha: {"document": "...", "metadata": {...}} ou campos escalares
+    soltos, usados como metadados. Valores não escalares (listas, objetos,
+    null) são descartados: o ChromaDB não os aceita.
+    """
+    source = os.path.basename(path)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            text = record.get(text_field)
+            if not text:
+                continue
+            metadata = record.get("metadata")
+            if not isinstance(metadata, dict):
+                metadata = {k: v for k, v in record.items() if k != text_field}
+            metadata = {k: v for k, v in metadata.items() if isinstance(v, METADATA_SCALARS)}
+            metadata.setdefault("source", source)
+            yield {"document": text, "metadata": metadata}
+
+def iter_csv_documents(path: str, text_field: str = "document") -> Iterator[Dict[str, Any]]:
+    """Lê documentos de um CSV com cabeçalho; demais colunas viram metadados"""
+    source = os.path.basename(path)
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            text = row.pop(text_field, None)
+            if not text:
+                continue
+            metadata = {k: v for k, v in row.items() if k and v not in (None, "")}
+            metadata.setdefault("source", source)
+            yield {"document": text, "metadata": metadata}
+
+def file_fingerprint(path: str, text_field: str = "document") -> Dict[str, Any]:
+    """Identidade de um arquivo de origem para validar checkpoints de ingestão"""
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns, "text_field": text_field}
+
+def iter_documents_file(path: str, text_field: str = "document") -> Iterator[Dict[str, Any]]:
+    """Escolhe o leitor pelo formato do arquivo (.jsonl/.ndjson ou .csv)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return iter_jsonl_documents(path, text_field)
+    if extension == ".csv":
+        return iter_csv_documents(path, text_field)
+    raise ValueError(f"Formato não suportado: {extension}")
+
+class LazyCollections(Mapping):
+    """Coleções por nome, abertas no primeiro acesso"""
+    
+    def __init__(self, names: Iterable[str], opener: Callable[[str], "chromadb.Collection"]):
+        self._names = tuple(names)
+        self._opener = opener
+        self._opened: Dict[str, "chromadb.Collection"] = {}
+        self._lock = threading.Lock()
+    
+    def __getitem__(self, name: str) -> "chromadb.Collection":
+        collection = self._opened.get(name)
+        if collection is None:
+            if name not in self._names:
+                raise KeyError(name)
+            with self._lock:
+                collection = self._opened.get(name)
+                if collection is None:
+                    collection = self._opened[name] = self._opener(name)
+        return collection
+    
+    def __contains__(self, name: object) -> bool:
+        # Não abre a coleção
+        return name in self._names
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def opened(self) -> List[str]:
+        return [name for name in self._names if name in self._opened]
 
 class NexusRAGSystem:
     """
@@ -18,38 +297,117 @@ class NexusRAGSystem:
     Baseado no ChromaDB com otimizações para educação emocional
     """
     
-    def __init__(self, persist_directory: str = "data/chroma"):
-        """Inicializa sistema RAG"""
+    COLLECTION_NAMES = ("facts_knowledge", "emotional_context", "age_appropriate",
+                        "safety_guidelines", "educational_content")
+    
+    def __init__(self, persist_directory: str = "data/chroma",
+                 embedding_function: Optional[Callable] = None,
+                 embedding_cache_size: int = 4096,
+                 embedding_cache_path: Optional[str] = None,
+                 embedding_model_id: Optional[str] = None,
+                 query_timeout: Optional[float] = None,
+                 lazy: bool = False,
+                 background_seed: bool = False):
+        """
+        Inicializa sistema RAG
+        
+        Args:
+            persist_directory: Diretório do ChromaDB
+            embedding_function: Função de embedding (padrão do ChromaDB se None)
+            embedding_cache_size: Entradas do cache de embeddings (0 desliga)
+            embedding_cache_path: Arquivo SQLite para o nível em disco do cache
+            embedding_model_id: Identificador do modelo no cache em disco
+                                (derivado da configuração da função se None)
+            query_timeout: Prazo (s) das consultas em paralelo de verify_fact
+            lazy: Adiar import do chromadb, abertura das coleções e carga do
+                  modelo até o primeiro uso; a base inicial não é semeada
+                  (ver seed_base_knowledge)
+            background_seed: No modo lazy, semear a base em uma thread
+        """
         
         # Criar diretório se não existir
         os.makedirs(persist_directory, exist_ok=True)
+        self.persist_directory = persist_directory
         
-        # Configurar cliente ChromaDB
-        self.client = chromadb.PersistentClient(
-            path=persist_directory,
-            settings=Settings(anonymized_telemetry=False)
-        )
+        # Cliente ChromaDB criado sob demanda (ver propriedade client)
+        self._client = None
+        self._client_lock = threading.Lock()
         
-        # Coleções principais
-        self.collections = {
-            "facts_knowledge": self._get_or_create_collection("facts_knowledge"),
-            "emotional_context": self._get_or_create_collection("emotional_context"),
-            "age_appropriate": self._get_or_create_collection("age_appropriate"),
-            "safety_guidelines": self._get_or_create_collection("safety_guidelines"),
-            "educational_content": self._get_or_create_collection("educational_content")
-        }
+        # Embeddings calculados aqui uma vez por texto e enviados prontos ao ChromaDB
+        self.embedding_function = embedding_function or DeferredEmbeddingFunction()
+        self.embedding_cache: Optional[EmbeddingCache] = None
+        if embedding_cache_size > 0:
+            self.embedding_cache = EmbeddingCache(self.embedding_function,
+                                                  max_entries=embedding_cache_size,
+                                                  disk_path=embedding_cache_path,
+                                                  model_id=embedding_model_id)
+        
+        # Consultas em paralelo entre coleções (pool criado sob demanda)
+        self.query_timeout = query_timeout
+        self._query_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
         
-        # Inicializar com dados básicos se necessário
-        self._initialize_base_knowledge()
+        # Coleções principais (abertas no primeiro acesso)
+        self.collections = LazyCollections(self.COLLECTION_NAMES, self._get_or_create_collection)
+        self.seed_thread: Optional[threading.Thread] = None
+        
+        if lazy:
+            if background_seed:
+                self.seed_base_knowledge(background=True)
+        else:
+            for name in self.COLLECTION_NAMES:
+                self.collections[name]
+            
+            # Inicializar com dados básicos se necessário
+            self._initialize_base_knowledge()
+    
+    @property
+    def client(self) -> "chromadb.ClientAPI":
+        """Cliente ChromaDB (import e conexão no primeiro acesso)"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import chromadb
+                    from chromadb.config import Settings
+                    
+                    self._client = chromadb.PersistentClient(
+                        path=self.persist_directory,
+                        settings=Settings(anonymized_telemetry=False)
+                    )
+        return self._client
+    
+    def seed_base_knowledge(self, background: bool = False) -> Optional[threading.Thread]:
+        """
+        Semeia a base de conhecimento inicial (se vazia)
+        
+        Passo offline (python chroma_manager.py seed <diretório>) ou em
+        background para que os workers não paguem o embedding no boot.
+        
+        Returns:
+            Thread de background, ou None se executado de forma síncrona
+        """
+        if not background:
+            self._initialize_base_knowledge()
+            return None
+        
+        self.seed_thread = threading.Thread(target=self._initialize_base_knowledge,
+                                            name="nexus-rag-seed", daemon=True)
+        self.seed_thread.start()
+        return self.seed_thread
     
-    def _get_or_create_collection(self, name: str) -> chromadb.Collection:
+    def _get_or_create_collection(self, name: str) -> "chromadb.Collection":
         """Obtém ou cria coleção"""
+        # A função adiada é repassada sem resolver: o modelo só é carregado
+        # se o ChromaDB precisar calcular um embedding
+        embedding_function = self.embedding_function
+        
         try:
-            return self.client.get_collection(name)
+            return self.client.get_collection(name, embedding_function=embedding_function)
         except:
             return self.client.create_collection(
                 name=name,
-                metadata={"description": f"Nexus Guardian D7D - {name}"}
+                metadata={"description": f"Nexus Guardian D7D - {name}"},
+                embedding_function=embedding_function
             )
     
     def _initialize_base_knowledge(self):
@@ -213,10 +571,157 @@ class NexusRAGSystem:
         
         self.collections[collection].add(
             documents=documents,
+            embeddings=self._embed(documents),
             metadatas=metadatas,
             ids=ids
         )
     
+    def ingest(self, collection: str, documents: Iterable[Dict[str, Any]],
+               batch_size: int = 256, checkpoint_path: Optional[str] = None,
+               source: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Ingestão em streaming com deduplicação e checkpoint
+        
+        O ID de cada documento é o sha256 do conteúdo: duplicatas exatas
+        (no mesmo lote ou já gravadas) são descartadas antes do embedding.
+        Após cada lote gravado, o checkpoint registra quantos registros foram
+        consumidos; uma nova chamada com o mesmo checkpoint retoma dali,
+        desde que a origem (source) seja a mesma registrada no checkpoint.
+        Registros sem texto (ausente, nulo ou não string) são contados em
+        "invalid" e ignorados.
+        
+        Args:
+            collection: Coleção de destino
+            documents: Iterador de {"document": str, "metadata": dict}
+                       (ver iter_documents_file)
+            batch_size: Documentos por upsert
+            checkpoint_path: Arquivo JSON de progresso (opcional)
+            source: Identidade da origem gravada no checkpoint
+                    (ex.: file_fingerprint; ingest_file preenche)
+        
+        Returns:
+            Estatísticas da ingestão
+        
+        Raises:
+            ValueError: Checkpoint de outra coleção ou de outra origem
+        """
+        
+        if collection not in self.collections:
+            raise ValueError(f"Coleção {collection} não existe")
+        if batch_size <= 0:
+            raise ValueError("batch_size deve ser positivo")
+        
+        batch_size = min(batch_size, getattr(self.client, "max_batch_size", batch_size))
+        target = self.collections[collection]
+        
+        stats = {"collection": collection, "read": 0, "ingested": 0, "duplicates": 0,
+                 "invalid": 0, "batches": 0, "resumed_from": 0}
+        
+        # Retomar de um checkpoint anterior
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            with open(checkpoint_path, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            if checkpoint.get("collection") != collection:
+                raise ValueError(f"Checkpoint pertence à coleção {checkpoint.get('collection')}")
+            if checkpoint.get("source") != source:
+                # Arquivo alterado ou trocado: a posição gravada não vale mais
+                raise ValueError(f"Checkpoint {checkpoint_path} pertence a outra origem: "
+                                 f"{checkpoint.get('source')}")
+            stats.update(checkpoint["stats"])
+            stats["resumed_from"] = checkpoint["consumed"]
+            documents = islice(documents, checkpoint["consumed"], None)
+        
+        consumed = stats["resumed_from"]
+        started = time.perf_counter()
+        iterator = iter(documents)
+        
+        while True:
+            records = list(islice(iterator, batch_size))
+            if not records:
+                break
+            consumed += len(records)
+            stats["read"] += len(records)
+            
+            # Deduplicar dentro do lote
+            batch: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+            for record in records:
+                text = record.get("document")
+                if not isinstance(text, str) or not text:
+                    stats["invalid"] += 1  # Sem texto: nada a indexar
+                    continue
+                doc_id = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+                if doc_id in batch:
+                    stats["duplicates"] += 1
+                else:
+                    batch[doc_id] = record
+            
+            # Descartar o que já está gravado (execuções anteriores ou outros lotes);
+            # get(ids=[]) devolveria a coleção inteira
+            existing = set(target.get(ids=list(batch), include=[])["ids"]) if batch else set()
+            stats["duplicates"] += len(existing)
+            for doc_id in existing:
+                del batch[doc_id]
+            
+            if batch:
+                texts = [record["document"] for record in batch.values()]
+                target.upsert(
+                    ids=list(batch),
+                    documents=texts,
+                    # Embedding direto: a carga em massa não deve expulsar consultas do cache
+                    embeddings=normalize_embeddings(self.embedding_function(texts), len(texts)),
+                    metadatas=[record.get("metadata") or {"source": "ingest"}
+                               for record in batch.values()]
+                )
+                stats["ingested"] += len(batch)
+            
+            stats["batches"] += 1
+            if checkpoint_path:
+                self._write_checkpoint(checkpoint_path, collection, consumed, stats, source)
+        
+        stats["elapsed"] = time.perf_counter() - started
+        return stats
+    
+    def ingest_file(self, collection: str, path: str, text_field: str = "document",
+                    batch_size: int = 256, checkpoint_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Ingestão de um arquivo JSONL/CSV (ver ingest)
+        O checkpoint fica vinculado ao caminho, tamanho e mtime do arquivo
+        """
+        return self.ingest(collection, iter_documents_file(path, text_field),
+                           batch_size=batch_size, checkpoint_path=checkpoint_path,
+                           source=file_fingerprint(path, text_field))
+    
+    def _write_checkpoint(self, path: str, collection: str, consumed: int, stats: Dict[str, Any],
+                          source: Optional[Dict[str, Any]] = None):
+        """Grava o checkpoint de forma atômica"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "collection": collection,
+                "source": source,
+                "consumed": consumed,
+                "stats": {k: stats[k] for k in ("read", "ingested", "duplicates", "invalid", "batches")},
+                "timestamp": datetime.now().isoformat()
+            }, f)
+        os.replace(tmp_path, path)
+    
+    def _embed(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Embeddings via cache; None deixa o ChromaDB calcular"""
+        if self.embedding_cache is None:
+            return None
+        return self.embedding_cache.embed(texts)
+    
+    def _embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings das consultas, sempre calculados aqui (com ou sem cache)"""
+        embeddings = self._embed(texts)
+        if embeddings is None:
+            embeddings = normalize_embeddings(self.embedding_function(texts), len(texts))
+        return embeddings
+    
+    def embedding_stats(self) -> Dict[str, Any]:
+        """Métricas do cache de embeddings (vazio se desligado)"""
+        return self.embedding_cache.stats() if self.embedding_cache is not None else {}
+    
     def query(self, query_text: str, collection: str = "facts_knowledge", 
               n_results: int = 3, age_filter: Optional[int] = None,
               **filters) -> Dict[str, Any]:
@@ -237,38 +742,174 @@ class NexusRAGSystem:
         if collection not in self.collections:
             raise ValueError(f"Coleção {collection} não existe")
         
+        return self._query(query_text, collection, n_results, age_filter, filters)
+    
+    def _query(self, query_text: str, collection: str, n_results: int,
+               age_filter: Optional[int], filters: Dict[str, Any],
+               query_embeddings: Optional[List[List[float]]] = None) -> Dict[str, Any]:
+        """Executa uma consulta (embedding da consulta opcionalmente já calculado)"""
+        return self._query_batch([query_text], collection, n_results, age_filter,
+                                 filters, query_embeddings)[0]
+    
+    def _query_batch(self, query_texts: List[str], collection: str, n_results: int,
+                     age_filter: Optional[int], filters: Dict[str, Any],
+                     query_embeddings: Optional[List[List[float]]] = None) -> List[Dict[str, Any]]:
+        """Uma única consulta ao ChromaDB para vários textos"""
+        
         # Preparar filtros
         where_filters = filters.copy()
         if age_filter:
             where_filters["age_group"] = {"$lte": age_filter}
         
-        # Executar consulta
+        # Executar consulta (embeddings podem ser arrays numpy: sem teste de verdade)
+        if query_embeddings is None:
+            query_embeddings = self._embed(query_texts)
+        elif len(query_embeddings) != len(query_texts):
+            raise ValueError(f"{len(query_embeddings)} embeddings para {len(query_texts)} consultas")
         results = self.collections[collection].query(
-            query_texts=[query_text],
+            query_texts=query_texts if query_embeddings is None else None,
+            query_embeddings=query_embeddings,
             n_results=n_results,
             where=where_filters if where_filters else None,
             include=["documents", "metadatas", "distances"]
         )
         
-        # Processar resultados
-        formatted_results = []
-        for i in range(len(results["documents"][0])):
-            formatted_results.append({
-                "document": results["documents"][0][i],
-                "metadata": results["metadatas"][0][i],
-                "distance": results["distances"][0][i],
-                "relevance_score": 1.0 - results["distances"][0][i]  # Converter distância para score
+        timestamp = datetime.now().isoformat()
+        batch = []
+        for q, query_text in enumerate(query_texts):
+            # Processar resultados
+            formatted_results = []
+            for i in range(len(results["documents"][q])):
+                formatted_results.append({
+                    "document": results["documents"][q][i],
+                    "metadata": results["metadatas"][q][i],
+                    "distance": results["distances"][q][i],
+                    "relevance_score": 1.0 - results["distances"][q][i]  # Converter distância para score
+                })
+            
+            batch.append({
+                "query": query_text,
+                "collection": collection,
+                "results_count": len(formatted_results),
+                "age_filter": age_filter,
+                "results": formatted_results,
+                "timestamp": timestamp
             })
         
+        return batch
+    
+    def query_many(self, query_texts: List[str], collection: str = "facts_knowledge",
+                   n_results: int = 3, age_filter: Optional[int] = None,
+                   chunk_size: int = 64, **filters) -> List[Dict[str, Any]]:
+        """
+        Consulta vários textos com uma chamada ao ChromaDB por bloco
+        
+        Args:
+            query_texts: Textos das consultas
+            collection: Coleção para consultar
+            n_results: Número de resultados por texto
+            age_filter: Filtrar por idade
+            chunk_size: Textos por chamada ao ChromaDB
+            filters: Filtros adicionais
+        
+        Returns:
+            Resultados na ordem de query_texts (mesmo formato de query)
+        """
+        
+        if collection not in self.collections:
+            raise ValueError(f"Coleção {collection} não existe")
+        
+        return self._query_chunks(query_texts, collection, n_results, age_filter,
+                                  filters, chunk_size, self._embed(query_texts))
+    
+    def _query_chunks(self, query_texts: List[str], collection: str, n_results: int,
+                      age_filter: Optional[int], filters: Dict[str, Any], chunk_size: int,
+                      query_embeddings: Optional[List[List[float]]]) -> List[Dict[str, Any]]:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size deve ser positivo")
+        
+        results = []
+        for i in range(0, len(query_texts), chunk_size):
+            chunk_embeddings = (query_embeddings[i:i + chunk_size]
+                                if query_embeddings is not None else None)
+            results.extend(self._query_batch(query_texts[i:i + chunk_size], collection,
+                                             n_results, age_filter, filters, chunk_embeddings))
+        return results
+    
+    def _get_query_executor(self) -> ThreadPoolExecutor:
+        if self._query_executor is None:
+            with self._executor_lock:
+                if self._query_executor is None:
+                    self._query_executor = ThreadPoolExecutor(
+                        max_workers=len(self.collections), thread_name_prefix="nexus-rag-query"
+                    )
+        return self._query_executor
+    
+    def query_collections(self, query_text: str, collections: Dict[str, Dict[str, Any]],
+                          timeout: Optional[float] = None,
+                          embed_once: bool = True) -> Dict[str, Any]:
+        """
+        Consulta várias coleções em paralelo sob um único prazo
+        
+        Args:
+            query_text: Texto da consulta
+            collections: Coleção -> parâmetros da consulta
+                         (n_results, age_filter e filtros adicionais)
+            timeout: Prazo total em segundos (None = sem prazo)
+            embed_once: Calcular o embedding da consulta uma única vez
+        
+        Returns:
+            Resultados por coleção e coleções que excederam o prazo
+        """
+        
+        for name in collections:
+            if name not in self.collections:
+                raise ValueError(f"Coleção {name} não existe")
+        
+        started = time.monotonic()
+        
+        query_embeddings = None
+        if embed_once:
+            query_embeddings = self._embed_queries([query_text])
+        
+        executor = self._get_query_executor()
+        futures = {}
+        for name, params in collections.items():
+            filters = dict(params)
+            n_results = filters.pop("n_results", 3)
+            age_filter = filters.pop("age_filter", None)
+            futures[name] = executor.submit(self._query, query_text, name, n_results,
+                                            age_filter, filters, query_embeddings)
+        
+        # O prazo inclui o tempo de embedding da consulta
+        remaining = None if timeout is None else max(timeout - (time.monotonic() - started), 0.0)
+        done, _ = wait(list(futures.values()), timeout=remaining)
+        
+        results = {}
+        timed_out = []
+        for name, future in futures.items():
+            if future in done:
+                results[name] = future.result()
+            else:
+                future.cancel()
+                timed_out.append(name)
+        
         return {
             "query": query_text,
-            "collection": collection,
-            "results_count": len(formatted_results),
-            "age_filter": age_filter,
-            "results": formatted_results,
+            "results": results,
+            "timed_out": timed_out,
+            "elapsed": time.monotonic() - started,
             "timestamp": datetime.now().isoformat()
         }
     
+    def close(self):
+        """Libera o pool de consultas e o cache de embeddings em disco"""
+        if self._query_executor is not None:
+            self._query_executor.shutdown(wait=True)
+            self._query_executor = None
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
+    
     def verify_fact(self, statement: str, age_context: int = 12) -> Dict[str, Any]:
         """
         Verifica uma afirmação contra o conhecimento factual
@@ -281,31 +922,89 @@ class NexusRAGSystem:
             Resultado da verificação
         """
         
-        # Consultar múltiplas coleções
-        fact_results = self.query(
-            statement, 
-            collection="facts_knowledge",
-            n_results=5,
-            age_filter=age_context
-        )
+        # Consultar múltiplas coleções em paralelo (uma coleção atrasada conta como vazia)
+        fan_out = self.query_collections(statement, {
+            "facts_knowledge": {"n_results": 5, "age_filter": age_context},
+            "emotional_context": {"n_results": 3}
+        }, timeout=self.query_timeout)
         
-        emotional_context = self.query(
-            statement,
-            collection="emotional_context",
-            n_results=3
-        )
+        fact_results = fan_out["results"].get("facts_knowledge", {"results": []})
+        emotional_context = fan_out["results"].get("emotional_context", {"results": []})
+        
+        return self._score_verification(statement, age_context, fact_results["results"],
+                                        emotional_context["results"], fan_out["timed_out"])
+    
+    def verify_facts(self, statements: List[str], age_context: int = 12,
+                     chunk_size: int = 64) -> List[Dict[str, Any]]:
+        """
+        Verifica várias afirmações (ex.: todas as frases de uma lição)
+        
+        Cada coleção recebe uma consulta ao ChromaDB por bloco de afirmações;
+        os embeddings são calculados uma vez e compartilhados entre as coleções.
+        Sob query_timeout, uma coleção atrasada conta como vazia e aparece em
+        "timed_out_collections".
+        
+        Args:
+            statements: Afirmações para verificar
+            age_context: Idade para contexto apropriado
+            chunk_size: Afirmações por chamada ao ChromaDB
+        
+        Returns:
+            Resultados na ordem de statements (mesmo formato de verify_fact)
+        """
+        
+        if not statements:
+            return []
+        
+        started = time.monotonic()
+        embeddings = self._embed_queries(statements)
+        
+        executor = self._get_query_executor()
+        futures = {
+            "facts_knowledge": executor.submit(self._query_chunks, statements, "facts_knowledge",
+                                               5, age_context, {}, chunk_size, embeddings),
+            "emotional_context": executor.submit(self._query_chunks, statements,
+                                                 "emotional_context", 3, None, {},
+                                                 chunk_size, embeddings)
+        }
+        
+        # O prazo inclui o tempo de embedding, como em query_collections
+        timeout = self.query_timeout
+        remaining = None if timeout is None else max(timeout - (time.monotonic() - started), 0.0)
+        done, _ = wait(list(futures.values()), timeout=remaining)
+        
+        batches = {}
+        timed_out = []
+        for name, future in futures.items():
+            if future in done:
+                batches[name] = future.result()
+            else:
+                future.cancel()
+                timed_out.append(name)
+                batches[name] = [{"results": []}] * len(statements)
+        
+        return [self._score_verification(statement, age_context, facts["results"],
+                                         emotional["results"], list(timed_out))
+                for statement, facts, emotional in zip(statements, batches["facts_knowledge"],
+                                                       batches["emotional_context"])]
+    
+    def _score_verification(self, statement: str, age_context: int,
+                            fact_results: List[Dict], emotional_results: List[Dict],
+                            timed_out: List[str]) -> Dict[str, Any]:
+        """Pontua uma afirmação a partir dos resultados das consultas"""
         
         # Analisar correspondências
         support_score = 0.0
         conflicting_facts = []
         supporting_facts = []
         
-        for result in fact_results["results"]:
+        statement_words = set(statement.lower().split())
+        
+        for result in fact_results:
             doc_lower = result["document"].lower()
-            statement_lower = statement.lower()
             
             # Verificar se há sobreposição de conceitos
-            common_words = set(doc_lower.split()) & set(statement_lower.split())
+            common_words = set(doc_lower.split()) & statement_words
             if len(common_words) >= 2:  # Pelo menos 2 palavras em comum
                 if any(neg in doc_lower for neg in ["não é", "errado", "falso", "mito"]):
                     conflicting_facts.append({
@@ -332,12 +1031,12 @@ class NexusRAGSystem:
         
         # Considerar contexto emocional
         emotional_tone = "neutral"
-        if emotional_context["results"]:
+        if emotional_results:
             # Análise simplificada do contexto emocional
-            emotional_docs = " ".join([r["document"] for r in emotional_context["results"]])
-            if any(word in emotional_docs.lower() for word in ["positivo", "alegre", "feliz"]):
+            emotional_docs = " ".join([r["document"] for r in emotional_results]).lower()
+            if any(word in emotional_docs for word in ["positivo", "alegre", "feliz"]):
                 emotional_tone = "positive"
-            elif any(word in emotional_docs.lower() for word in ["negativo", "triste", "raiva"]):
+            elif any(word in emotional_docs for word in ["negativo", "triste", "raiva"]):
                 emotional_tone = "negative"
         
         return {
@@ -347,7 +1046,8 @@ class NexusRAGSystem:
                 "supporting_facts_count": len(supporting_facts),
                 "conflicting_facts_count": len(conflicting_facts),
                 "emotional_context": emotional_tone,
-                "age_appropriateness": self._check_age_appropriateness(statement, age_context)
+                "age_appropriateness": self._check_age_appropriateness(statement, age_context),
+                "timed_out_collections": timed_out
             },
             "supporting_facts": supporting_facts[:3],  # Limitar a 3
             "conflicting_facts": conflicting_facts[:3],
@@ -416,10 +1116,11 @@ class NexusRAGSystem:
             "total_collections": len(self.collections),
             "total_documents": sum(s["document_count"] for s in stats.values()),
             "collections": stats,
+            "embedding_cache": self.embedding_stats(),
             "timestamp": datetime.now().isoformat()
         }
     
-    def _get_metadata_fields(self, collection: chromadb.Collection) -> List[str]:
+    def _get_metadata_fields(self, collection: "chromadb.Collection") -> List[str]:
         """Obtém campos de metadados de uma coleção"""
         # Método simplificado - em produção, precisaria de amostragem
         try:
@@ -436,6 +1137,16 @@ class NexusRAGSystem:
 
 # Teste rápido
 if __name__ == "__main__":
+    import sys
+    
+    # Semeadura offline: python chroma_manager.py seed [diretório]
+    if len(sys.argv) >= 2 and sys.argv[1] == "seed":
+        rag = NexusRAGSystem(persist_directory=sys.argv[2] if len(sys.argv) > 2 else "data/chroma",
+                             lazy=True)
+        rag.seed_base_knowledge()
+        rag.close()
+        sys.exit(0)
+    
     print("📚 Testando Nexus RAG System...")
     
     # Inicializar sistema
@@ -0,0 +1,246 @@
+"""
+Testes do NexusRAGSystem com um cliente ChromaDB falso em memória
+(cache de embeddings, leitura de documentos, ingestão e consultas)
+
+Uso: pytest
+"""
+
+import json
+import time
+
+import pytest
+
+from src.rag.chroma_manager import (
+    DeferredEmbeddingFunction, EmbeddingCache, NexusRAGSystem, file_fingerprint,
+    iter_jsonl_documents
+)
+
+class NamedModel:
+    """Função de embedding configurada por nome de modelo"""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.calls = 0
+
+    def __call__(self, input):
+        self.calls += 1
+        return [[float(len(text)), float(len(self.model_name))] for text in input]
+
+class ArrayLike(list):
+    """Imita um ndarray: teste de verdade ambíguo e recusado pelo ChromaDB"""
+
+    def __bool__(self):
+        raise ValueError("The truth value of an array is ambiguous")
+
+class ArrayModel(NamedModel):
+    """Função de embedding que devolve arrays, como sentence-transformers"""
+
+    def __call__(self, input):
+        return ArrayLike(ArrayLike(vector) for vector in super().__call__(input))
+
+def _plain(embeddings):
+    if type(embeddings) is not list or any(type(v) is not list for v in embeddings):
+        raise ValueError(f"Expected embeddings to be a list, got {embeddings!r}")
+    return embeddings
+
+class FakeCollection:
+    """Subconjunto da API de chromadb.Collection usado pelo NexusRAGSystem"""
+
+    def __init__(self, name, delay=0.0):
+        self.name = name
+        self.delay = delay
+        self.records = {}
+
+    def count(self):
+        return len(self.records)
+
+    def get(self, ids=None, include=None, limit=None):
+        found = [doc_id for doc_id in (list(self.records) if not ids else ids) if doc_id in self.records]
+        return {"ids": found[:limit] if limit else found,
+                "metadatas": [self.records[doc_id][2] for doc_id in found]}
+
+    def add(self, ids, documents, metadatas, embeddings=None):
+        self.upsert(ids, documents, _plain(embeddings), metadatas)
+
+    def upsert(self, ids, documents, embeddings, metadatas):
+        for doc_id, document, vector, metadata in zip(ids, documents, _plain(embeddings), metadatas):
+            self.records[doc_id] = (document, vector, metadata)
+
+    def query(self, query_texts=None, query_embeddings=None, n_results=3, where=None,
+              include=None):
+        time.sleep(self.delay)
+        limit = (where or {}).get("age_group", {}).get("$lte")
+        candidates = [(document, vector, metadata)
+                      for document, vector, metadata in self.records.values()
+                      if limit is None or metadata.get("age_group", 0) <= limit]
+        results = {"documents": [], "metadatas": [], "distances": []}
+        for query in _plain(query_embeddings):
+            ranked = sorted(candidates, key=lambda c: (sum((a - b) ** 2 for a, b in zip(query, c[1])),
+                                                       c[0]))[:n_results]
+            results["documents"].append([c[0] for c in ranked])
+            results["metadatas"].append([c[2] for c in ranked])
+            results["distances"].append([sum((a - b) ** 2 for a, b in zip(query, c[1])) / 1e4
+                                         for c in ranked])
+        return results
+
+class FakeClient:
+    max_batch_size = 1000
+
+    def __init__(self):
+        self.collections = {}
+
+    def get_collection(self, name, embedding_function=None):
+        if name not in self.collections:
+            raise ValueError(name)
+        return self.collections[name]
+
+    def create_collection(self, name, metadata=None, embedding_function=None):
+        self.collections[name] = FakeCollection(name)
+        return self.collections[name]
+
+@pytest.fixture
+def rag(tmp_path):
+    system = NexusRAGSystem(str(tmp_path / "chroma"), embedding_function=ArrayModel("array-model"),
+                            lazy=True)
+    system._client = FakeClient()
+    yield system
+    system.close()
+
+def test_ingest_converts_array_embeddings_and_skips_invalid_documents(rag, tmp_path):
+    path = tmp_path / "docs.jsonl"
+    lines = [{"document": "primeiro"}, {"document": None}, {"document": 42},
+             {"document": "segundo", "metadata": {"grade": 2}}, {"document": "primeiro"}]
+    path.write_text("\n".join(json.dumps(line) for line in lines), encoding="utf-8")
+
+    stats = rag.ingest_file("educational_content", str(path), batch_size=2)
+    assert (stats["read"], stats["ingested"], stats["invalid"], stats["duplicates"]) == (4, 2, 1, 1)
+    stats = rag.ingest("educational_content", [{"document": ["lista"]}, {"metadata": {}}])
+    assert (stats["ingested"], stats["invalid"]) == (0, 2)
+    assert rag.collections["educational_content"].count() == 2
+
+def test_ingest_rejects_wrong_number_of_vectors(rag):
+    rag.embedding_function = lambda input: [[1.0]]
+    with pytest.raises(ValueError):
+        rag.ingest("educational_content", [{"document": "a"}, {"document": "b"}])
+
+def test_disk_tier_is_keyed_by_model_name(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    small = EmbeddingCache(NamedModel("mini"), disk_path=path)
+    small.embed(["olá"])
+    small.close()
+
+    large = EmbeddingCache(NamedModel("large-model"), disk_path=path)
+    assert large.embed(["olá"]) == [[3.0, 11.0]]
+    assert large.stats()["disk_hits"] == 0
+    large.close()
+
+    again = EmbeddingCache(NamedModel("mini"), disk_path=path)
+    assert again.embed(["olá"]) == [[3.0, 4.0]]
+    assert again.embedding_function.calls == 0
+    again.close()
+
+def test_disk_tier_requires_stable_model_id(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    with pytest.raises(ValueError):
+        EmbeddingCache(lambda input: [[0.0] for _ in input], disk_path=path)
+
+    cache = EmbeddingCache(lambda input: [[0.0] for _ in input], disk_path=path,
+                           model_id="hash-v1")
+    assert cache.embed(["a", "a"]) == [[0.0], [0.0]]
+    cache.close()
+
+def test_deferred_model_id_does_not_load_model(tmp_path):
+    function = DeferredEmbeddingFunction()
+    cache = EmbeddingCache(function, disk_path=str(tmp_path / "embeddings.sqlite"))
+    assert cache.model_id == DeferredEmbeddingFunction.model_id
+    assert function._function is None
+    cache.close()
+
+def test_jsonl_metadata_keeps_only_scalars(tmp_path):
+    path = tmp_path / "docs.jsonl"
+    records = [{"document": "a", "metadata": {"grade": 3, "tags": ["x"], "extra": {"k": 1},
+                                              "empty": None, "ok": True}},
+               {"document": "b", "grade": 5, "tags": ["y"]}]
+    path.write_text("\n".join(json.dumps(record) for record in records), encoding="utf-8")
+
+    assert [doc["metadata"] for doc in iter_jsonl_documents(str(path))] == [
+        {"grade": 3, "ok": True, "source": "docs.jsonl"},
+        {"grade": 5, "source": "docs.jsonl"}
+    ]
+
+def test_file_fingerprint_changes_with_content(tmp_path):
+    path = tmp_path / "docs.jsonl"
+    path.write_text('{"document": "a"}\n', encoding="utf-8")
+    before = file_fingerprint(str(path))
+    assert file_fingerprint(str(path)) == before
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"document": "b"}\n')
+    assert file_fingerprint(str(path)) != before
+
+FACTS = [{"document": "A água ferve a 100 graus ao nível do mar", "metadata": {"age_group": 8}},
+         {"document": "Não é verdade que a água ferve a 50 graus", "metadata": {"age_group": 10}},
+         {"document": "A Terra gira em torno do Sol", "metadata": {"age_group": 6}},
+         {"document": "Mito: a Terra é plana", "metadata": {"age_group": 12}},
+         {"document": "Plantas precisam de luz para crescer", "metadata": {"age_group": 15}}]
+EMOTIONS = [{"document": "Aprender é alegre e feliz"},
+            {"document": "Errar pode deixar a criança triste"}]
+STATEMENTS = ["A água ferve a 100 graus", "A Terra é plana", "Plantas precisam de luz",
+              "Gatos gostam de leite"]
+
+def _seeded(rag):
+    rag.ingest("facts_knowledge", FACTS)
+    rag.ingest("emotional_context", EMOTIONS)
+    return rag
+
+def _without_timestamp(verification):
+    return {key: value for key, value in verification.items() if key != "timestamp"}
+
+def test_query_collections_keeps_request_order(rag):
+    _seeded(rag)
+    rag.collections["facts_knowledge"].delay = 0.2  # Termina depois das demais
+
+    started = time.monotonic()
+    fan_out = rag.query_collections("água", {"facts_knowledge": {"n_results": 2},
+                                             "emotional_context": {"n_results": 1},
+                                             "age_appropriate": {}})
+    assert time.monotonic() - started < 0.2 * 2  # Coleções consultadas em paralelo
+    assert list(fan_out["results"]) == ["facts_knowledge", "emotional_context", "age_appropriate"]
+    assert (_without_timestamp(fan_out["results"]["facts_knowledge"])
+            == _without_timestamp(rag.query("água", "facts_knowledge", 2)))
+    assert fan_out["timed_out"] == []
+
+def test_query_collections_deadline_reports_slow_collections(rag):
+    _seeded(rag)
+    rag.collections["emotional_context"].delay = 0.5
+    rag.collections["facts_knowledge"].delay = 0.5
+
+    started = time.monotonic()
+    fan_out = rag.query_collections("água", {"facts_knowledge": {},
+                                             "age_appropriate": {},
+                                             "emotional_context": {}}, timeout=0.1)
+    assert time.monotonic() - started < 0.3
+    assert fan_out["timed_out"] == ["facts_knowledge", "emotional_context"]
+    assert list(fan_out["results"]) == ["age_appropriate"]
+
+def test_verify_facts_matches_verify_fact(rag):
+    _seeded(rag)
+    batch = rag.verify_facts(STATEMENTS, age_context=10, chunk_size=3)
+    single = [rag.verify_fact(statement, age_context=10) for statement in STATEMENTS]
+    assert [_without_timestamp(v) for v in batch] == [_without_timestamp(v) for v in single]
+    assert any(v["supporting_facts"] for v in batch)
+    assert any(v["conflicting_facts"] for v in batch)
+
+def test_verify_facts_bounded_by_query_timeout(rag):
+    _seeded(rag)
+    rag.query_timeout = 0.1
+    rag.collections["emotional_context"].delay = 0.5
+
+    started = time.monotonic()
+    batch = rag.verify_facts(STATEMENTS, age_context=10)
+    assert time.monotonic() - started < 0.3
+    assert all(v["verification_summary"]["timed_out_collections"] == ["emotional_context"]
+               for v in batch)
+
+    single = [rag.verify_fact(statement, age_context=10) for statement in STATEMENTS]
+    assert [_without_timestamp(v) for v in batch] == [_without_timestamp(v) for v in single]
@@ -0,0 +1,199 @@
+"""
+Testes do ClaudeEthicalOverride com léxicos mapeados em memória
+
+Uso: pytest
+"""
+
+import asyncio
+import gc
+import json
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.core.claude_ethics import (
+    SUBSTRING_SCAN_MAX_PATTERNS, ChildContext, ClaudeEthicalOverride, EthicsPoolFull,
+    FlagMatcher, MappedLexicon, SafetySession, StreamAborted, compile_lexicon
+)
+
+CONTEXT = ChildContext(8, "calm", "visual", [], [])
+
+def _compile(path, flag_rules):
+    compile_lexicon(str(path), flag_rules, ["love", "fear"], ["death"])
+    return str(path)
+
+def test_small_lexicon_scan_matches_automaton():
+    matcher = FlagMatcher({"a": ["hurt", "hurt you", "you"], "b": ["hurt", "ou"]})
+    assert matcher._substrings is not None
+    for text in ("I HURT YOU, hurt you", "İ hurt you İ", "nada aqui", "hurthurt"):
+        assert matcher.scan(text) == matcher.feed(0, text)[1]
+    assert [(h.flag, h.start, h.end) for h in matcher.scan("hurt you")] == [
+        ("a", 0, 4), ("b", 0, 4), ("a", 0, 8), ("a", 5, 8), ("b", 6, 8)
+    ]
+
+def test_large_lexicon_uses_automaton():
+    rules = {"flag": [f"padrão {i}" for i in range(SUBSTRING_SCAN_MAX_PATTERNS + 1)]}
+    assert FlagMatcher(rules)._substrings is None
+
+def test_reload_keeps_old_matchers_usable(tmp_path):
+    first = _compile(tmp_path / "first.nxlex", {"violence": ["hurt you"]})
+    second = _compile(tmp_path / "second.nxlex", {"secrecy": ["keep secret"]})
+    ethics = ClaudeEthicalOverride(lexicon_path=first)
+
+    screener = ethics.stream_screener(CONTEXT)
+    assert screener.feed("I will ") == "I will "
+    ethics.load_lexicon(second)
+
+    # O screener criado antes da troca continua no léxico antigo
+    with pytest.raises(StreamAborted):
+        screener.feed("hurt you")
+    assert ethics.safety_check("keep secret", CONTEXT)["flags"] == ["secrecy"]
+
+def test_mapping_released_with_last_reference(tmp_path):
+    lexicon = MappedLexicon(_compile(tmp_path / "lex.nxlex", {"violence": ["hurt you"]}))
+    matcher = lexicon.matcher("red_flags")
+    mapped = lexicon._mapping.mmap
+    mapping = weakref.ref(lexicon._mapping)
+
+    del lexicon
+    gc.collect()
+    assert mapping() is not None
+    assert [hit.flag for hit in matcher.scan("I hurt you")] == ["violence"]
+
+    del matcher
+    gc.collect()
+    assert mapping() is None
+    assert mapped.closed
+
+def test_reload_lets_queued_async_checks_finish():
+    ethics = ClaudeEthicalOverride()
+    ethics.configure_async_pool(workers=1, max_pending=4)
+
+    async def scenario():
+        texts = [f"texto {i} " * 20000 for i in range(12)]
+        pending = [asyncio.ensure_future(ethics.safety_check_async(text, CONTEXT))
+                   for text in texts]
+        await asyncio.sleep(0.1)  # Primeiros pedidos já no worker, os demais na fila
+        old_pool = ethics._async_pool
+        ethics.load_rules({"secrecy": ["keep secret"]})
+        after = await ethics.safety_check_async("keep secret", CONTEXT)
+        results = await asyncio.gather(*pending)
+        await ethics.close_async_pool_async()
+        return old_pool, results, after
+
+    old_pool, results, after = asyncio.run(scenario())
+    assert len(results) == 12
+    assert old_pool.stats()["cancelled"] == 0
+    assert after["flags"] == ["secrecy"]
+
+def test_verdict_cache_follows_rule_reloads(tmp_path):
+    ethics = ClaudeEthicalOverride(flag_rules={"violence": ["hurt you"]},
+                                   verdict_cache_size=16)
+    text = "keep secret or I hurt you"
+    assert ethics.safety_check(text, CONTEXT)["flags"] == ["violence"]
+    assert ethics.safety_check(text, CONTEXT)["flags"] == ["violence"]
+    assert ethics.verdict_cache.hits == 1
+
+    ethics.load_rules({"violence": ["hurt you"], "secrecy": ["keep secret"]})
+    assert sorted(ethics.safety_check(text, CONTEXT)["flags"]) == ["secrecy", "violence"]
+
+    ethics.load_lexicon(_compile(tmp_path / "lex.nxlex", {"secrecy": ["keep secret"]}))
+    assert ethics.safety_check(text, CONTEXT)["flags"] == ["secrecy"]
+
+def test_verdict_cache_shared_between_threads():
+    ethics = ClaudeEthicalOverride(verdict_cache_size=8)
+    texts = [f"texto {i}" for i in range(64)]
+
+    def check(offset):
+        for i in range(400):
+            text = texts[(offset + i) % len(texts)]
+            assert ethics.safety_check(text, CONTEXT)["safe"]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(check, range(8)))
+
+    stats = ethics.verdict_cache.stats()
+    assert stats["entries"] <= 8
+    assert stats["hits"] + stats["misses"] == 8 * 400
+
+def test_async_pool_serves_several_event_loops():
+    ethics = ClaudeEthicalOverride()
+    ethics.configure_async_pool(workers=1, max_pending=1)
+
+    async def scenario():
+        # max_pending=1: os pedidos disputam o semáforo do loop atual
+        texts = ["hurt you", "nada aqui", "keep secret"]
+        return await asyncio.gather(*(ethics.safety_check_async(text, CONTEXT)
+                                      for text in texts))
+
+    try:
+        first = asyncio.run(scenario())
+        second = asyncio.run(scenario())
+    finally:
+        ethics.close_async_pool()
+    assert [r["safe"] for r in first] == [r["safe"] for r in second]
+
+def test_cancelled_caller_keeps_slot_until_job_finishes():
+    ethics = ClaudeEthicalOverride()
+    pool = ethics.configure_async_pool(workers=1, max_pending=1, reject_when_full=True)
+
+    async def scenario():
+        task = asyncio.ensure_future(ethics.safety_check_async("texto " * 2000000, CONTEXT))
+        await asyncio.sleep(0.3)  # Job já em execução no worker
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # O worker ainda está ocupado: o slot continua tomado
+        busy = pool.stats()["pending"]
+        with pytest.raises(EthicsPoolFull):
+            await pool.submit("nada aqui", CONTEXT)
+
+        while pool.stats()["pending"]:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0)  # Liberação do slot agendada no loop
+        return busy, await pool.submit("nada aqui", CONTEXT)
+
+    try:
+        busy, result = asyncio.run(scenario())
+    finally:
+        ethics.close_async_pool()
+    assert busy == 1
+    assert result["safe"]
+
+TURNS = ["I love you. You are safe with me.",
+         "I fear the dark. Keep secret about the dark room, please.",
+         "Death is sad. We can talk about it together."]
+
+def test_session_snapshot_restore_round_trip():
+    ethics = ClaudeEthicalOverride(flag_rules={"secrecy": ["keep secret"]})
+    session = ethics.start_session(CONTEXT)
+    for turn in TURNS:
+        session.add_turn(turn)
+
+    snapshot = json.loads(json.dumps(session.snapshot()))
+    restored = SafetySession.restore(ethics, CONTEXT, snapshot)
+    assert restored.assessment() == session.assessment()
+
+    # Mais turnos nas duas sessões: as estatísticas continuam idênticas
+    for turn in reversed(TURNS):
+        assert restored.add_turn(turn)["conversation"] == session.add_turn(turn)["conversation"]
+    assert restored.snapshot() == session.snapshot()
+
+    with pytest.raises(ValueError):
+        SafetySession.restore(ethics, CONTEXT, dict(snapshot, version=0))
+
+def test_session_flag_history_is_bounded():
+    ethics = ClaudeEthicalOverride(flag_rules={"secrecy": ["keep secret"]})
+    session = ethics.start_session(CONTEXT, max_flag_history=3)
+    for _ in range(10):
+        session.add_turn("Keep secret, ok?")
+
+    assert [entry["turn"] for entry in session.flag_history] == [8, 9, 10]
+    assert session.flag_counts == {"secrecy": 10}
+    assert session.assessment()["turns"] == 10
+
+    restored = SafetySession.restore(ethics, CONTEXT, session.snapshot())
+    restored.add_turn("Keep secret, ok?")
+    assert [entry["turn"] for entry in restored.flag_history] == [9, 10, 11]
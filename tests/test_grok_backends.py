@@ -0,0 +1,140 @@
+"""
+Testes dos backends de resposta do GrokTruthEngine contra o StubAnswerServer
+
+Uso: pytest
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.grok_engine import (
+    AnswerBackend, AnswerBackendError, GrokTruthEngine, HTTPAnswerBackend,
+    StubAnswerServer, placeholder_answer
+)
+
+QUESTION = "Por que você acredita que 'o céu é azul' é verdade?"
+
+def run(coro):
+    return asyncio.run(coro)
+
+async def _started(delay: float = 0.0, port: int = 0) -> StubAnswerServer:
+    server = StubAnswerServer(port=port, delay=delay)
+    await server.start()
+    return server
+
+def test_answer_backend_is_abstract():
+    with pytest.raises(TypeError):
+        AnswerBackend()
+
+def test_keep_alive_reuses_connection():
+    async def scenario():
+        server = await _started()
+        backend = HTTPAnswerBackend(port=server.port, batch_window=0.001)
+        try:
+            answers = [await backend.generate(QUESTION, level) for level in range(1, 6)]
+        finally:
+            await backend.close()
+            await server.close()
+        return server, backend, answers
+
+    server, backend, answers = run(scenario())
+    assert answers == [placeholder_answer(QUESTION, level) for level in range(1, 6)]
+    assert backend.connections_opened == 1
+    assert server.connections == 1
+    assert server.batches == 5
+
+def test_concurrent_requests_are_batched():
+    async def scenario():
+        server = await _started()
+        backend = HTTPAnswerBackend(port=server.port, batch_window=0.05, max_batch_size=8)
+        questions = [f"Quais evidências suportam '{i}'?" for i in range(20)]
+        try:
+            answers = await asyncio.gather(*(backend.generate(q, 4) for q in questions))
+        finally:
+            await backend.close()
+            await server.close()
+        return server, questions, answers
+
+    server, questions, answers = run(scenario())
+    assert answers == [placeholder_answer(q, 4) for q in questions]
+    assert server.items == 20
+    assert server.batches == 3  # 8 + 8 + 4
+
+def test_timeout_releases_connection_slot():
+    async def scenario():
+        server = await _started(delay=100.0)
+        backend = HTTPAnswerBackend(port=server.port, max_connections=1,
+                                    batch_window=0.001, timeout=0.2)
+        try:
+            with pytest.raises(AnswerBackendError):
+                await backend.generate(QUESTION, 1)
+
+            # A troca expirada libera o slot: o próximo pedido é atendido
+            server.delay = 0.0
+            answer = await backend.generate(QUESTION, 1)
+            await asyncio.sleep(0)
+            inflight = len(backend._inflight)
+        finally:
+            await backend.close()
+            await server.close()
+        return answer, inflight
+
+    answer, inflight = run(scenario())
+    assert answer == placeholder_answer(QUESTION, 1)
+    assert inflight == 0
+
+def test_close_fails_inflight_requests():
+    async def scenario():
+        server = await _started(delay=100.0)
+        backend = HTTPAnswerBackend(port=server.port, batch_window=0.001, timeout=30.0)
+        try:
+            pending = asyncio.ensure_future(backend.generate(QUESTION, 1))
+            await asyncio.sleep(0.1)  # Lote já enviado, aguardando o servidor
+            started = asyncio.get_running_loop().time()
+            await backend.close()
+            with pytest.raises(AnswerBackendError, match="backend fechado"):
+                await asyncio.wait_for(pending, 1.0)
+            return asyncio.get_running_loop().time() - started
+        finally:
+            await server.close()
+
+    assert run(scenario()) < 1.0
+
+def test_reconnects_after_server_restart():
+    async def scenario():
+        server = await _started()
+        port = server.port
+        backend = HTTPAnswerBackend(port=port, batch_window=0.001, timeout=2.0)
+        try:
+            first = await backend.generate(QUESTION, 1)
+            await server.close()
+
+            server = await _started(port=port)
+            second = await backend.generate(QUESTION, 2)
+        finally:
+            await backend.close()
+            await server.close()
+        return first, second, backend.connections_opened
+
+    first, second, opened = run(scenario())
+    assert first == placeholder_answer(QUESTION, 1)
+    assert second == placeholder_answer(QUESTION, 2)
+    assert opened == 2
+
+def test_async_analysis_matches_sync():
+    statements = ["Todos os gatos sempre caem de pé", "A água ferve a 100 graus"]
+
+    async def scenario():
+        server = await _started()
+        backend = HTTPAnswerBackend(port=server.port)
+        try:
+            return await GrokTruthEngine().analyze_statements_async(statements, backend)
+        finally:
+            await backend.close()
+            await server.close()
+
+    engine = GrokTruthEngine()
+    expected = [engine.analyze_statement(statement) for statement in statements]
+    results = run(scenario())
+    assert results == expected
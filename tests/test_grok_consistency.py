@@ -0,0 +1,28 @@
+"""
+Testes da análise de consistência entre sentenças do GrokTruthEngine
+
+Uso: pytest
+"""
+
+from src.core.grok_engine import GrokTruthEngine
+
+def contradictions(text):
+    return GrokTruthEngine().analyze_document(text)["contradictions"]
+
+def test_different_objects_are_not_contradictions():
+    assert contradictions("Gatos sempre bebem leite. Gatos não bebem água.") == []
+
+def test_negated_claim_is_reported_once_per_pair():
+    found = contradictions("Gatos sempre bebem leite. Gatos nunca bebem leite.")
+    assert [(c["sentence_index"], c["contradicted_by"]) for c in found] == [(0, 1)]
+
+def test_chunked_feed_matches_whole_document():
+    text = ("A água ferve a 100 graus. Todos os gatos caem de pé... "
+            "Alguns gatos não caem de pé! O valor é 3.5 hoje? A água não ferve a 100 graus.")
+    engine = GrokTruthEngine()
+    whole = engine.analyze_document(text)
+    for size in (1, 2, 7):
+        chunked = engine.analyze_document(text[i:i + size] for i in range(0, len(text), size))
+        assert chunked == whole
+    assert len(whole["sentences"]) == 5
+    assert [(c["sentence_index"], c["contradicted_by"]) for c in whole["contradictions"]] == [(1, 2), (0, 4)]
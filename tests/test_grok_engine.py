@@ -0,0 +1,55 @@
+"""
+Testes da análise em lote do GrokTruthEngine (resumo e pool de processos)
+
+Uso: pytest
+"""
+
+import asyncio
+import re
+
+from src.core.grok_engine import GrokTruthEngine, PlaceholderAnswerBackend
+
+STATEMENTS = ["Todos os gatos sempre caem de pé", "A água ferve a 100 graus",
+              "Obviamente o melhor caminho é este", "Só os fortes sobrevivem"]
+
+def without_whys(analysis):
+    return {key: value for key, value in analysis.items() if key != "seven_whys_analysis"}
+
+def test_summary_only_matches_full_analysis():
+    engine = GrokTruthEngine()
+    full = [without_whys(engine.analyze_statement(s)) for s in STATEMENTS]
+    assert list(engine.analyze_statements(STATEMENTS, summary_only=True)) == full
+    assert list(engine.analyze_statements(STATEMENTS, workers=2, chunk_size=1,
+                                          summary_only=True)) == full
+
+    async def scenario():
+        return await engine.analyze_statements_async(STATEMENTS, PlaceholderAnswerBackend(),
+                                                     summary_only=True)
+    assert asyncio.run(scenario()) == full
+
+def test_summary_only_skips_question_classification(monkeypatch):
+    engine = GrokTruthEngine()
+    monkeypatch.setattr(engine, "_classify_question",
+                        lambda question: (_ for _ in ()).throw(AssertionError(question)))
+    assert "truth_score" in engine.analyze_statement(STATEMENTS[0], include_whys=False)
+
+def test_pool_workers_use_caller_configuration():
+    engine = GrokTruthEngine(bias_patterns=[(r"gatos?", "viés felino")])
+    results = list(engine.analyze_statements(STATEMENTS, workers=2, chunk_size=1))
+    assert results == [engine.analyze_statement(s) for s in STATEMENTS]
+    assert results[0]["potential_biases"] == ["viés felino"]
+
+def test_patterns_with_own_groups_are_scanned_separately():
+    bias_patterns = [(r"(?P<animal>gatos?)", "viés felino"),
+                     (r"\b(\w+)\s+\1\b", "repetição"),
+                     (r"(?P<x>sempre) (?P=x)", "ênfase"),
+                     (r"(?i)ÁGUA", "água"),
+                     (r"só\s+\w+", "viés de exclusividade")]
+    engine = GrokTruthEngine(bias_patterns=bias_patterns)
+    assert [name for name, _ in engine._own_scanners] == ["bias_0", "bias_1", "bias_2", "bias_3"]
+
+    statements = STATEMENTS + ["muito muito bom", "sempre sempre", "gato gato"]
+    for statement in statements:
+        expected = [label for pattern, label in bias_patterns
+                    if re.search(pattern, statement, re.IGNORECASE)]
+        assert engine.scan_statement(statement).biases == expected
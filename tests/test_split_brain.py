@@ -0,0 +1,126 @@
+"""
+Testes do prazo (max_processing_time) da SplitBrainArchitecture
+
+Uso: pytest
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.architecture.split_brain import (
+    AnalyzedText, HemisphereCancelled, HemispherePayload, SplitBrainArchitecture
+)
+
+@pytest.fixture
+def brain():
+    split_brain = SplitBrainArchitecture()
+    split_brain.config["max_processing_time"] = 0.2
+    yield split_brain
+    split_brain.shutdown()
+
+def test_late_hemisphere_gives_degraded_result(brain, monkeypatch):
+    original = brain._analyze_emotional_tone
+    release = threading.Event()
+
+    def stuck(text, cancel_event=None):
+        release.wait(5)  # Não coopera com o cancelamento
+        return original(text, cancel_event)
+
+    monkeypatch.setattr(brain, "_analyze_emotional_tone", stuck)
+    started = time.perf_counter()
+    result = brain.process_input("A água é boa.")
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.0
+    assert result["processing_summary"]["degraded"] is True
+    assert result["processing_summary"]["missing_hemispheres"] == ["emotional"]
+    assert result["content"]["primary_basis"] == "analytical"
+
+    # O worker preso foi substituído: a próxima requisição cumpre o prazo
+    monkeypatch.setattr(brain, "_analyze_emotional_tone", original)
+    result = brain.process_input("A água é boa.")
+    assert result["processing_summary"]["degraded"] is False
+
+    release.set()
+
+def test_long_stage_checks_cancellation(brain):
+    cancel_event = threading.Event()
+    cancel_event.set()
+    with pytest.raises(HemisphereCancelled):
+        brain._analyze_emotional_tone(AnalyzedText.from_text("bom " * 10000), cancel_event)
+
+def test_unserializable_context_bypasses_result_cache():
+    brain = SplitBrainArchitecture(result_cache_bytes=1024 * 1024)
+    try:
+        context = {"session": object()}
+        assert brain._result_key("A água é boa.", context) is None
+        brain.process_input("A água é boa.", context)
+        brain.process_input("A água é boa.", context)
+        assert brain.cache_stats()["hits"] == 0
+    finally:
+        brain.shutdown()
+
+def test_hemisphere_payload_is_abstract():
+    with pytest.raises(TypeError):
+        HemispherePayload()
+
+def test_stuck_workers_are_capped(brain, monkeypatch):
+    brain.config["max_processing_time"] = 0.05
+    brain.process_input("Aquecimento.")
+    baseline = threading.active_count()
+
+    original = brain._analyze_emotional_tone
+    release = threading.Event()
+
+    def ignores_cancellation(text, cancel_event=None):
+        release.wait(10)  # Chamada bloqueante sem pontos de cancelamento
+        return original(text, None)
+
+    monkeypatch.setattr(brain, "_analyze_emotional_tone", ignores_cancellation)
+    cap = brain.config["max_stuck_workers"]
+    try:
+        for i in range(cap * 3):
+            result = brain.process_input(f"Pedido {i}.")
+            assert result["processing_summary"]["missing_hemispheres"] == ["emotional"]
+            assert threading.active_count() <= baseline + cap
+
+        # No limite, o hemisfério falha rápido em vez de esperar o prazo
+        started = time.perf_counter()
+        brain.process_input("Mais um.")
+        assert time.perf_counter() - started < brain.config["max_processing_time"]
+    finally:
+        monkeypatch.setattr(brain, "_analyze_emotional_tone", original)
+        release.set()
+
+    # Os presos terminam e os substitutos voltam
+    deadline = time.monotonic() + 5
+    while threading.active_count() > baseline and time.monotonic() < deadline:
+        time.sleep(0.01)
+    brain.config["max_processing_time"] = 2.0
+    assert brain.process_input("Depois.")["processing_summary"]["degraded"] is False
+
+def test_cache_hit_reports_its_own_timings():
+    brain = SplitBrainArchitecture(result_cache_bytes=1024 * 1024)
+    try:
+        first = brain.process_input("A água é boa.")
+        assert first["processing_summary"]["hemisphere_times"]
+        hit = brain.process_input("A água é boa.")
+        assert hit["processing_summary"]["cache_hit"] is True
+        assert hit["processing_summary"]["hemisphere_times"] == {}
+        assert hit["content"] == first["content"]
+    finally:
+        brain.shutdown()
+
+def test_result_key_ignores_operational_config():
+    brain = SplitBrainArchitecture(result_cache_bytes=1024 * 1024)
+    try:
+        key = brain._result_key("A água é boa.", {})
+        brain.config.update(max_processing_time=1.0, workers_per_hemisphere=2,
+                            log_level="DEBUG", max_stuck_workers=8)
+        assert brain._result_key("A água é boa.", {}) == key
+        brain.config["enable_cross_validation"] = False
+        assert brain._result_key("A água é boa.", {}) != key
+    finally:
+        brain.shutdown()